@@ -4,9 +4,10 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.db import DatabaseError, transaction
 from django.db.models import Count
 from django.utils import timezone
+from django.utils.html import format_html
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.middleware.security import SecurityMiddleware
 import json
@@ -18,11 +19,14 @@ from .auth_models import (
     ProfileShareToken, ProfileAccessLog, 
     ProfileVisibility, ProfileShare
 )
-from .utils import ProfileTemplateRenderer
+from .utils import default_renderer
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Markup for profiles whose template is missing; values are escaped on fill
+UNTEMPLATED_PROFILE_HTML = '<div><h1>{headline}</h1><p>{summary}</p></div>'
+
 class ProfileAuthMiddleware:
     """Middleware for OAuth-like profile authentication"""
     
@@ -89,7 +93,7 @@ class ProfileAuthMiddleware:
                 method=request.method,
             )
         except Exception as e:
-            logger.error(f"Failed to log profile access: {str(e)}")
+            logger.error("Failed to log profile access: %s", e)
     
     def _get_client_ip(self, request):
         """Get client IP address"""
@@ -144,8 +148,14 @@ class ProfileShareTokenView(View):
                 'tokens': token_data
             })
             
+        except DatabaseError as e:
+            logger.error("Database error fetching share tokens: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to fetch tokens'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error fetching share tokens: {str(e)}")
+            logger.error("Error fetching share tokens: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to fetch tokens'
@@ -206,8 +216,14 @@ class ProfileShareTokenView(View):
                 'success': False,
                 'error': 'Invalid request data'
             }, status=400)
+        except DatabaseError as e:
+            logger.error("Database error creating share token: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to create token'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error creating share token: {str(e)}")
+            logger.error("Error creating share token: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to create token'
@@ -254,8 +270,14 @@ class ProfileShareTokenView(View):
                 'success': False,
                 'error': 'Token not found'
             }, status=404)
+        except DatabaseError as e:
+            logger.error("Database error updating token: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to update token'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error updating token: {str(e)}")
+            logger.error("Error updating token: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to update token'
@@ -287,8 +309,14 @@ class ProfileShareTokenView(View):
                 'success': False,
                 'error': 'Token not found'
             }, status=404)
+        except DatabaseError as e:
+            logger.error("Database error revoking token: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to revoke token'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error revoking token: {str(e)}")
+            logger.error("Error revoking token: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to revoke token'
@@ -343,8 +371,14 @@ class ProfileVisibilityView(View):
                 )
             })
             
+        except DatabaseError as e:
+            logger.error("Database error fetching visibility settings: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to fetch visibility settings'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error fetching visibility settings: {str(e)}")
+            logger.error("Error fetching visibility settings: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to fetch visibility settings'
@@ -393,8 +427,14 @@ class ProfileVisibilityView(View):
                 'message': 'Visibility settings updated successfully'
             })
             
+        except DatabaseError as e:
+            logger.error("Database error updating visibility settings: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to update visibility settings'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error updating visibility settings: {str(e)}")
+            logger.error("Error updating visibility settings: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to update visibility settings'
@@ -443,8 +483,14 @@ class ProfileShareView(View):
                 'shares': share_data
             })
             
+        except DatabaseError as e:
+            logger.error("Database error fetching profile shares: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to fetch shares'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error fetching profile shares: {str(e)}")
+            logger.error("Error fetching profile shares: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to fetch shares'
@@ -507,8 +553,14 @@ class ProfileShareView(View):
                 }
             })
             
+        except DatabaseError as e:
+            logger.error("Database error creating profile share: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to create share'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error creating profile share: {str(e)}")
+            logger.error("Error creating profile share: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to create share'
@@ -523,8 +575,7 @@ class ProfileAccessView(View):
         try:
             # Get profile
             if username:
-                profile_user = User.objects.get(username=username)
-                profile = profile_user.clawedin_profile
+                profile = Profile.load_for_render(user__username=username)
             elif hasattr(request, 'profile_token') and request.profile_token:
                 profile = request.profile_token.profile
             else:
@@ -542,9 +593,6 @@ class ProfileAccessView(View):
                     'error': f'Access denied: {reason}'
                 }, status=403)
             
-            # Render profile
-            renderer = ProfileTemplateRenderer()
-            
             # Get template and theme
             from .models import ProfileTemplate, ProfileTheme
             template_name = profile.profile_template or 'executive_pro'
@@ -555,17 +603,19 @@ class ProfileAccessView(View):
             except ProfileTemplate.DoesNotExist:
                 template = None
             
-            try:
-                theme = ProfileTheme.objects.get(name=theme_name, is_active=True)
-            except ProfileTheme.DoesNotExist:
-                theme = None
+            # Only the theme's existence matters here, so skip loading its CSS
+            has_theme = ProfileTheme.objects.filter(name=theme_name, is_active=True).exists()
             
             if template:
-                rendered_html = renderer.render_profile(profile, template)
-                rendered_css = renderer.render_css(template) if theme else ''
+                rendered_html = default_renderer.render_profile(profile, template)
+                rendered_css = default_renderer.render_css(template) if has_theme else ''
             else:
                 # Fallback rendering
-                rendered_html = f"<div><h1>{profile.headline}</h1><p>{profile.summary}</p></div>"
+                rendered_html = format_html(
+                    UNTEMPLATED_PROFILE_HTML,
+                    headline=profile.headline,
+                    summary=profile.summary,
+                )
                 rendered_css = ""
             
             # Record successful access
@@ -598,13 +648,19 @@ class ProfileAccessView(View):
                 }
             })
             
-        except User.DoesNotExist:
+        except Profile.DoesNotExist:
             return JsonResponse({
                 'success': False,
                 'error': 'Profile not found'
             }, status=404)
+        except DatabaseError as e:
+            logger.error("Database error accessing profile: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to access profile'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error accessing profile: {str(e)}")
+            logger.error("Error accessing profile: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to access profile'
@@ -666,7 +722,7 @@ class ProfileAccessView(View):
                 status_code=200
             )
         except Exception as e:
-            logger.error(f"Failed to log successful access: {str(e)}")
+            logger.error("Failed to log successful access: %s", e)
     
     def _log_denied_access(self, request, profile, reason):
         """Log denied profile access"""
@@ -686,7 +742,7 @@ class ProfileAccessView(View):
                 error_message=reason
             )
         except Exception as e:
-            logger.error(f"Failed to log denied access: {str(e)}")
+            logger.error("Failed to log denied access: %s", e)
     
     def _get_client_ip(self, request):
         """Get client IP address"""
@@ -746,8 +802,14 @@ def get_profile_analytics(request):
             }
         })
         
+    except DatabaseError as e:
+        logger.error("Database error fetching profile analytics: %s", e)
+        return JsonResponse({
+            'success': False,
+            'error': 'Failed to fetch analytics'
+        }, status=503)
     except Exception as e:
-        logger.error(f"Error fetching profile analytics: {str(e)}")
+        logger.error("Error fetching profile analytics: %s", e)
         return JsonResponse({
             'success': False,
             'error': 'Failed to fetch analytics'
@@ -31,6 +31,9 @@ class ProfessionalContent(models.Model):
     
     # Content Information
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='content_authored')
+    # Denormalized author display fields so feed reads skip the user join
+    author_username = models.CharField(max_length=150, blank=True, db_index=True)
+    author_full_name = models.CharField(max_length=255, blank=True)
     content_type = models.CharField(max_length=20, choices=CONTENT_TYPES)
     title = models.CharField(max_length=200)
     content = models.TextField()
@@ -84,12 +87,44 @@ class ProfessionalContent(models.Model):
             models.Index(fields=['is_featured', 'published_at']),
             models.Index(fields=['engagement_score', 'published_at']),
             models.Index(fields=['published_at']),
+            # Activity feed: filter on approval, order by engagement then recency
+            models.Index(fields=['is_approved', '-engagement_score', '-published_at', '-id'], name='content_feed_idx'),
+            models.Index(fields=['author', '-published_at'], name='content_author_time_idx'),
         ]
         ordering = ['-published_at']
     
     def __str__(self):
         return f"{self.content_type}: {self.title}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded author so save() can tell when it changes"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_author_id = instance.__dict__.get('author_id', models.DEFERRED)
+        return instance
+    
+    def refresh_from_db(self, *args, **kwargs):
+        """Record the author loaded by a refresh, including lazy loads of a deferred author"""
+        super().refresh_from_db(*args, **kwargs)
+        if 'author_id' in self.__dict__:
+            self._loaded_author_id = self.author_id
+    
+    def save(self, *args, **kwargs):
+        """Populate denormalized author fields on first save or author change"""
+        # A still-deferred author was never loaded or assigned, so it cannot have changed
+        author_changed = False
+        if 'author_id' in self.__dict__ and self.author_id:
+            loaded_author_id = getattr(self, '_loaded_author_id', self.author_id)
+            author_changed = not self.author_username or self.author_id != loaded_author_id
+        if author_changed:
+            self.author_username = self.author.username
+            self.author_full_name = self.author.get_full_name()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'author_username', 'author_full_name'}
+        super().save(*args, **kwargs)
+        self._loaded_author_id = self.author_id
+    
     def calculate_engagement_score(self):
         """Calculate engagement score based on interactions"""
         # Weighted engagement calculation
@@ -712,4 +747,30 @@ class ContentModerationQueue(models.Model):
                 content.is_approved = False
                 content.save(update_fields=['is_approved'])
             except ProfessionalContent.DoesNotExist:
-                pass
\ No newline at end of file
+                pass
+
+
+# =============================================================================
+# Signal handlers for denormalized author fields
+# =============================================================================
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+
+# User fields copied onto ProfessionalContent
+AUTHOR_NAME_FIELDS = frozenset({'username', 'first_name', 'last_name'})
+
+
+@receiver(post_save, sender=User)
+def sync_content_author_fields(sender, instance, created, **kwargs):
+    """Propagate username/full name changes to the user's authored content"""
+    update_fields = kwargs.get('update_fields')
+    if created or (update_fields is not None and not AUTHOR_NAME_FIELDS & set(update_fields)):
+        return
+    username = instance.username
+    full_name = instance.get_full_name()
+    # Bump updated_at so cached feed items keyed on it pick up the new names
+    ProfessionalContent.objects.filter(author=instance).exclude(
+        author_username=username, author_full_name=full_name
+    ).update(author_username=username, author_full_name=full_name, updated_at=timezone.now())
@@ -0,0 +1,220 @@
+"""
+Test suite for professional content and activity feed
+Following TDD RED-GREEN-REFACTOR methodology
+"""
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, Client
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Profile
+from .content_models import ProfessionalContent, ProfessionalProject
+
+User = get_user_model()
+
+class ActivityFeedAPITest(TestCase):
+    """Test activity feed API endpoint"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='feeduser',
+            email='feed@example.com',
+            user_type='human'
+        )
+
+        self.profile = Profile.objects.create(
+            user=self.user,
+            headline='Feed Reader',
+            summary='Reads the activity feed'
+        )
+
+        for i in range(5):
+            ProfessionalContent.objects.create(
+                author=self.user,
+                content_type='post',
+                title=f'Post {i}',
+                content=f'Content {i}',
+                visibility='public',
+                engagement_score=float(i % 2)
+            )
+
+        self.client.force_login(self.user)
+
+    def test_invalid_pagination_params(self):
+        """GREEN: Test malformed page params fall back to defaults"""
+        url = reverse('clawedin:activity_feed')
+        response = self.client.get(url, {'page': 'abc', 'page_size': 'xyz'})
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['pagination']['page'], 1)
+        self.assertEqual(data['pagination']['page_size'], 20)
+        self.assertEqual(len(data['feed']), 5)
+
+    def test_cursor_pagination(self):
+        """GREEN: Test keyset pagination walks the feed without gaps or repeats"""
+        url = reverse('clawedin:activity_feed')
+        seen = []
+        cursor = ''
+
+        while cursor is not None:
+            response = self.client.get(url, {'cursor': cursor, 'page_size': 2})
+            self.assertEqual(response.status_code, 200)
+
+            data = response.json()
+            self.assertTrue(data['success'])
+            self.assertNotIn('total_items', data['pagination'])
+            seen.extend(item['id'] for item in data['feed'])
+            cursor = data['pagination']['next_cursor']
+
+        expected = list(
+            ProfessionalContent.objects.order_by('-engagement_score', '-published_at', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        """GREEN: Test malformed cursor is rejected"""
+        url = reverse('clawedin:activity_feed')
+        response = self.client.get(url, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 400)
+
+        data = response.json()
+        self.assertFalse(data['success'])
+
+    def test_connections_feed_without_connections(self):
+        """GREEN: Test connections feed is empty for users without connections"""
+        url = reverse('clawedin:activity_feed')
+        response = self.client.get(url, {'feed_type': 'connections'})
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['feed'], [])
+        self.assertEqual(data['pagination']['total_items'], 0)
+
+class ContentAuthorFieldsTest(TestCase):
+    """Test denormalized author fields stay in sync with the author"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='author', email='author@example.com', user_type='human'
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', user_type='human'
+        )
+        self.content = ProfessionalContent.objects.create(
+            author=self.user, content_type='post', title='Post', content='Content'
+        )
+
+    def test_rename_updates_content(self):
+        """GREEN: Test renaming the author refreshes fields and updated_at"""
+        updated_at = self.content.updated_at
+        self.user.first_name = 'Ada'
+        self.user.save()
+
+        self.content.refresh_from_db()
+        self.assertEqual(self.content.author_full_name, 'Ada')
+        self.assertGreater(self.content.updated_at, updated_at)
+
+    def test_unrelated_user_save_skips_sync(self):
+        """GREEN: Test saves that do not touch name fields skip the content update"""
+        with CaptureQueriesContext(connection) as queries:
+            self.user.save(update_fields=['last_login'])
+
+        content_table = ProfessionalContent._meta.db_table
+        self.assertFalse([
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE') and content_table in query['sql']
+        ])
+
+    def test_author_change_refreshes_fields(self):
+        """GREEN: Test reassigning content copies the new author's names"""
+        content = ProfessionalContent.objects.get(pk=self.content.pk)
+        content.author = self.other
+        content.save(update_fields=['author'])
+
+        content.refresh_from_db()
+        self.assertEqual(content.author_username, 'other')
+
+    def test_deferred_author_not_resynced(self):
+        """GREEN: Test loading a deferred author does not count as an author change"""
+        content = ProfessionalContent.objects.defer('author').get(pk=self.content.pk)
+        self.assertEqual(content.author_id, self.user.id)
+        content.title = 'Renamed'
+
+        with CaptureQueriesContext(connection) as queries:
+            content.save(update_fields=['title'])
+
+        self.assertEqual(len(queries.captured_queries), 1)
+
+
+class ProfessionalProjectAPITest(TransactionTestCase):
+    """Test professional project API endpoint, committing like production so on-commit tasks run"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='projectuser',
+            email='project@example.com',
+            user_type='human'
+        )
+        self.collaborator = User.objects.create_user(
+            username='collaborator',
+            email='collaborator@example.com',
+            user_type='human'
+        )
+
+        Profile.objects.create(
+            user=self.user,
+            headline='Project Owner',
+            summary='Ships projects'
+        )
+
+        self.client.force_login(self.user)
+        self.url = reverse('clawedin:project_list')
+        self.payload = {
+            'project_type': 'work',
+            'title': 'Platform Rewrite',
+            'description': 'Rewrote the platform',
+            'start_date': '2025-01-01',
+            'role': 'Lead',
+            'collaborator_ids': [self.collaborator.id],
+        }
+
+    def test_create_project_sets_collaborators(self):
+        """GREEN: Test collaborators are set after commit by the immediate task backend"""
+        response = self.client.post(self.url, data=self.payload, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['collaborators_status'], 'set')
+        self.assertEqual([c['id'] for c in data['project']['collaborators']], [self.collaborator.id])
+
+    def test_create_project_reports_failed_collaborators(self):
+        """GREEN: Test a collaborators task that raises is reported as failed"""
+        with mock.patch('clawedin.tasks.ProfessionalProject') as project_model, \
+                self.assertLogs('clawedin.content_views', level='ERROR'):
+            project_model.DoesNotExist = ProfessionalProject.DoesNotExist
+            project_model.objects.get.side_effect = RuntimeError('task exploded')
+            response = self.client.post(self.url, data=self.payload, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['collaborators_status'], 'failed')
+        self.assertEqual(data['project']['collaborators'], [])
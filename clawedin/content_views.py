@@ -4,15 +4,26 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.db import DatabaseError, transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.core.paginator import Paginator
-from django.db.models import Q, Count, Avg, Sum
+from django.core.cache import cache
+from django.tasks import TaskResultStatus
+from django.db.models import Q, Count, Sum, Value, CharField
+from django.db.models.functions import Concat, Trim
+from datetime import datetime
+import base64
+import binascii
 import json
 import logging
+import operator
+import orjson
 
 from .models import Profile
+from .utils import json_response
+from .tasks import set_project_collaborators
 from .content_models import (
     ProfessionalContent, ProfessionalArticle, ProfessionalAchievement,
     ProfessionalProject, ContentInteraction, ContentModerationQueue
@@ -21,6 +32,60 @@ from .content_models import (
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# User full name resolved by the database, matching User.get_full_name()
+FULL_NAME_EXPRESSION = Trim(Concat('first_name', Value(' '), 'last_name', output_field=CharField()))
+
+# Columns read by ActivityFeedView._serialize_feed_item
+FEED_ITEM_FIELDS = (
+    'id', 'content_type', 'title', 'summary', 'featured_image',
+    'views', 'likes', 'shares', 'comments_count', 'engagement_score',
+    'published_at', 'is_pinned', 'is_featured', 'author_id',
+    'author_username', 'author_full_name', 'updated_at',
+)
+
+# Single C-level lookup for every attribute a feed item renders
+_FEED_ITEM_ATTRS = operator.attrgetter(
+    'id', 'content_type', 'title', 'summary', 'featured_image',
+    'author_id', 'author_username', 'author_full_name',
+    'views', 'likes', 'shares', 'comments_count', 'engagement_score',
+    'published_at', 'is_pinned', 'is_featured',
+)
+
+FEED_ITEM_CACHE_TIMEOUT = 300
+
+def _feed_item_cache_key(content):
+    """Cache key for a serialized feed item.
+
+    Counter updates save with update_fields and skip updated_at, so the
+    engagement score is part of the key to pick up new interactions.
+    """
+    return f"feed-item:{content.id}:{content.updated_at.timestamp()}:{content.engagement_score}"
+
+def _parse_feed_params(request):
+    """Parse feed pagination params once, falling back to defaults on bad input"""
+    parsed = getattr(request, '_parsed_feed_params', None)
+    if parsed is None:
+        try:
+            page = max(1, int(request.GET.get('page', '1')))
+            page_size = min(50, max(1, int(request.GET.get('page_size', '20'))))
+        except ValueError:
+            page, page_size = 1, 20
+        parsed = request._parsed_feed_params = (page, page_size)
+    return parsed
+
+def _encode_feed_cursor(content):
+    """Encode the feed sort key of the last item on a page as an opaque cursor"""
+    key = [content.engagement_score, content.published_at, content.id]
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode('ascii')
+
+def _decode_feed_cursor(cursor):
+    """Decode a feed cursor into (engagement_score, published_at, id); raises ValueError"""
+    try:
+        score, published_at, content_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return float(score), datetime.fromisoformat(published_at), int(content_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise ValueError('Invalid feed cursor') from e
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ProfessionalContentView(View):
     """API for managing professional content"""
@@ -86,8 +151,14 @@ class ProfessionalContentView(View):
                 }
             })
             
+        except DatabaseError as e:
+            logger.error("Database error fetching content: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to fetch content'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error fetching content: {str(e)}")
+            logger.error("Error fetching content: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to fetch content'
@@ -145,8 +216,14 @@ class ProfessionalContentView(View):
                 'success': False,
                 'error': 'Invalid request data'
             }, status=400)
+        except DatabaseError as e:
+            logger.error("Database error creating content: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to create content'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error creating content: {str(e)}")
+            logger.error("Error creating content: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to create content'
@@ -184,15 +261,15 @@ class ProfessionalContentView(View):
             'created_at': content.created_at.isoformat(),
             
             'author': {
-                'id': content.author.id,
-                'username': content.author.username,
-                'full_name': getattr(content.author, 'full_name', ''),
+                'id': content.author_id,
+                'username': content.author_username,
+                'full_name': content.author_full_name,
             },
             
             'permissions': {
                 'can_view': content.can_user_view(user)[0],
-                'can_edit': user == content.author,
-                'can_delete': user == content.author,
+                'can_edit': user.id == content.author_id,
+                'can_delete': user.id == content.author_id,
                 'can_moderate': user.is_staff or user.is_superuser,
             }
         }
@@ -330,8 +407,14 @@ class ContentInteractionView(View):
                     'message': f'{interaction_type.capitalize()} added'
                 })
                 
+        except DatabaseError as e:
+            logger.error("Database error creating interaction: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to create interaction'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error creating interaction: {str(e)}")
+            logger.error("Error creating interaction: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to create interaction'
@@ -374,8 +457,14 @@ class ContentInteractionView(View):
                 'success': False,
                 'error': 'Interaction not found'
             }, status=404)
+        except DatabaseError as e:
+            logger.error("Database error removing interaction: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to remove interaction'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error removing interaction: {str(e)}")
+            logger.error("Error removing interaction: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to remove interaction'
@@ -455,8 +544,14 @@ class ProfessionalAchievementView(View):
                 'achievements': achievement_data
             })
             
+        except DatabaseError as e:
+            logger.error("Database error fetching achievements: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to fetch achievements'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error fetching achievements: {str(e)}")
+            logger.error("Error fetching achievements: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to fetch achievements'
@@ -518,8 +613,14 @@ class ProfessionalAchievementView(View):
                 'message': 'Achievement created successfully'
             })
             
+        except DatabaseError as e:
+            logger.error("Database error creating achievement: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to create achievement'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error creating achievement: {str(e)}")
+            logger.error("Error creating achievement: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to create achievement'
@@ -566,8 +667,14 @@ class ProfessionalAchievementView(View):
                 'success': False,
                 'error': 'Achievement not found'
             }, status=404)
+        except DatabaseError as e:
+            logger.error("Database error updating achievement: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to update achievement'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error updating achievement: {str(e)}")
+            logger.error("Error updating achievement: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to update achievement'
@@ -600,8 +707,14 @@ class ProfessionalAchievementView(View):
                 'success': False,
                 'error': 'Achievement not found'
             }, status=404)
+        except DatabaseError as e:
+            logger.error("Database error deleting achievement: %s", e)
+            return JsonResponse({
+                'success': False,
+                'error': 'Failed to delete achievement'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error deleting achievement: {str(e)}")
+            logger.error("Error deleting achievement: %s", e)
             return JsonResponse({
                 'success': False,
                 'error': 'Failed to delete achievement'
@@ -656,7 +769,7 @@ class ProfessionalProjectView(View):
             for project in page_obj:
                 project_data.append(self._serialize_project(project, request.user))
             
-            return JsonResponse({
+            return json_response({
                 'success': True,
                 'projects': project_data,
                 'pagination': {
@@ -669,9 +782,15 @@ class ProfessionalProjectView(View):
                 }
             })
             
+        except DatabaseError as e:
+            logger.error("Database error fetching projects: %s", e)
+            return json_response({
+                'success': False,
+                'error': 'Failed to fetch projects'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error fetching projects: {str(e)}")
-            return JsonResponse({
+            logger.error("Error fetching projects: %s", e)
+            return json_response({
                 'success': False,
                 'error': 'Failed to fetch projects'
             }, status=500)
@@ -679,7 +798,7 @@ class ProfessionalProjectView(View):
     def post(self, request):
         """Create new project"""
         if not request.user.is_authenticated:
-            return JsonResponse({
+            return json_response({
                 'success': False,
                 'error': 'Authentication required'
             }, status=401)
@@ -692,7 +811,7 @@ class ProfessionalProjectView(View):
             required_fields = ['project_type', 'title', 'description', 'start_date', 'role']
             for field in required_fields:
                 if field not in data:
-                    return JsonResponse({
+                    return json_response({
                         'success': False,
                         'error': f'Missing required field: {field}'
                     }, status=400)
@@ -703,8 +822,9 @@ class ProfessionalProjectView(View):
                 project_type=data['project_type'],
                 title=data['title'],
                 description=data['description'],
-                start_date=data['start_date'],
-                end_date=data.get('end_date'),
+                # Parsed so the serialized duration can do date arithmetic
+                start_date=parse_date(data['start_date']),
+                end_date=parse_date(data['end_date']) if data.get('end_date') else None,
                 status=data.get('status', 'completed'),
                 role=data['role'],
                 team_size=data.get('team_size'),
@@ -727,24 +847,58 @@ class ProfessionalProjectView(View):
                 metadata=data.get('metadata', {})
             )
             
-            # Add collaborators if specified
+            # Add collaborators if specified. Enqueued once the project row is
+            # committed so a worker never looks it up too early; with no TASKS
+            # setting the default immediate backend still runs it inline.
+            collaborators_status = None
             if 'collaborator_ids' in data:
-                collaborators = User.objects.filter(id__in=data['collaborator_ids'])
-                project.collaborators.set(collaborators)
+                results = []
+                collaborator_ids = list(data['collaborator_ids'])
+                transaction.on_commit(
+                    lambda: results.append(self._enqueue_collaborators(project.id, collaborator_ids))
+                )
+                result = results[0] if results else None
+                if result is not None and result.status == TaskResultStatus.SUCCESSFUL:
+                    collaborators_status = 'set'
+                elif result is not None and result.status == TaskResultStatus.FAILED:
+                    collaborators_status = 'failed'
+                else:
+                    collaborators_status = 'pending'
             
-            return JsonResponse({
+            response_data = {
                 'success': True,
                 'project': self._serialize_project(project, request.user),
                 'message': 'Project created successfully'
-            })
+            }
+            if collaborators_status:
+                response_data['collaborators_status'] = collaborators_status
             
+            return json_response(response_data)
+            
+        except DatabaseError as e:
+            logger.error("Database error creating project: %s", e)
+            return json_response({
+                'success': False,
+                'error': 'Failed to create project'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error creating project: {str(e)}")
-            return JsonResponse({
+            logger.error("Error creating project: %s", e)
+            return json_response({
                 'success': False,
                 'error': 'Failed to create project'
             }, status=500)
     
+    def _enqueue_collaborators(self, project_id, collaborator_ids):
+        """Enqueue the collaborators task and log a failure reported at enqueue time"""
+        result = set_project_collaborators.enqueue(project_id, collaborator_ids)
+        if result.status == TaskResultStatus.FAILED:
+            # Failed results are final; nothing retries them
+            logger.error(
+                "Setting collaborators for project %s failed:\n%s",
+                project_id, result.errors[-1].traceback
+            )
+        return result
+    
     def _serialize_project(self, project, user):
         """Serialize project for API response"""
         return {
@@ -752,12 +906,12 @@ class ProfessionalProjectView(View):
             'project_type': project.project_type,
             'title': project.title,
             'description': project.description,
-            'start_date': project.start_date.isoformat(),
-            'end_date': project.end_date.isoformat() if project.end_date else None,
+            'start_date': project.start_date,
+            'end_date': project.end_date,
             'status': project.status,
             'role': project.role,
             'team_size': project.team_size,
-            'budget': str(project.budget) if project.budget else None,
+            'budget': project.budget,
             'technologies_used': project.technologies_used,
             'skills_demonstrated': project.skills_demonstrated,
             'responsibilities': project.responsibilities,
@@ -768,14 +922,9 @@ class ProfessionalProjectView(View):
             'demo_url': project.demo_url,
             'documentation_url': project.documentation_url,
             'images': project.images,
-            'collaborators': [
-                {
-                    'id': collab.id,
-                    'username': collab.username,
-                    'full_name': getattr(collab, 'full_name', ''),
-                }
-                for collab in project.collaborators.all()
-            ],
+            'collaborators': list(
+                project.collaborators.annotate(full_name=FULL_NAME_EXPRESSION).values('id', 'username', 'full_name')
+            ),
             'awards': project.awards,
             'publications': project.publications,
             'patents': project.patents,
@@ -792,8 +941,8 @@ class ProfessionalProjectView(View):
                 'can_delete': user and user == project.profile.user,
                 'can_view': project.is_public or (user and user == project.profile.user),
             },
-            'created_at': project.created_at.isoformat(),
-            'updated_at': project.updated_at.isoformat(),
+            'created_at': project.created_at,
+            'updated_at': project.updated_at,
         }
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -803,7 +952,7 @@ class ActivityFeedView(View):
     def get(self, request):
         """Get activity feed"""
         if not request.user.is_authenticated:
-            return JsonResponse({
+            return json_response({
                 'success': False,
                 'error': 'Authentication required'
             }, status=401)
@@ -811,51 +960,57 @@ class ActivityFeedView(View):
         try:
             # Parse query parameters
             feed_type = request.GET.get('feed_type', 'all')
-            page = int(request.GET.get('page', 1))
-            page_size = min(int(request.GET.get('page_size', 20)), 50)
+            page, page_size = _parse_feed_params(request)
             
-            # Get user's connections
+            # Get user's connections (denormalized on the profile)
             user_profile = request.user.clawedin_profile
-            connected_users = User.objects.filter(
-                clawedin_profile__in=user_profile.top_connections.all()
-            )
+            connected_ids = user_profile.connection_user_ids
+            
+            # Nothing to show from connections; skip the query entirely
+            if not connected_ids and feed_type in ('connections', 'network'):
+                return self._empty_feed_response(request, page, page_size)
             
             # Build base query
             if feed_type == 'connections':
                 # Content from connections only
                 query = ProfessionalContent.objects.filter(
-                    author__in=connected_users,
+                    author_id__in=connected_ids,
                     is_approved=True
                 )
             elif feed_type == 'network':
                 # Content from 2nd degree network
                 # This would be more complex in a real implementation
                 query = ProfessionalContent.objects.filter(
-                    author__in=connected_users,
+                    author_id__in=connected_ids,
+                    is_approved=True
+                )
+            elif not connected_ids:
+                # All content for users without connections is just public content
+                query = ProfessionalContent.objects.filter(
+                    visibility='public',
                     is_approved=True
                 )
             else:
                 # All content (connections + public)
                 query = ProfessionalContent.objects.filter(
-                    Q(author__in=connected_users) | Q(visibility='public'),
+                    Q(author_id__in=connected_ids) | Q(visibility='public'),
                     is_approved=True
                 )
             
-            # Order by engagement and recency
-            query = query.order_by('-engagement_score', '-published_at')
+            # Order by engagement and recency, loading only the columns the feed renders
+            query = query.only(*FEED_ITEM_FIELDS).order_by('-engagement_score', '-published_at', '-id')
+            
+            if 'cursor' in request.GET:
+                return self._get_cursor_page(query, request.GET['cursor'], page_size)
             
             # Paginate
             paginator = Paginator(query, page_size)
             page_obj = paginator.get_page(page)
+            contents = list(page_obj)
             
-            # Serialize feed items
-            feed_data = []
-            for content in page_obj:
-                feed_data.append(self._serialize_feed_item(content, request.user))
-            
-            return JsonResponse({
+            return json_response({
                 'success': True,
-                'feed': feed_data,
+                'feed': self._serialize_feed_page(contents),
                 'pagination': {
                     'page': page,
                     'page_size': page_size,
@@ -863,46 +1018,155 @@ class ActivityFeedView(View):
                     'total_items': paginator.count,
                     'has_next': page_obj.has_next(),
                     'has_previous': page_obj.has_previous(),
+                    'next_cursor': _encode_feed_cursor(contents[-1]) if page_obj.has_next() else None,
                 }
             })
             
+        except DatabaseError as e:
+            logger.error("Database error fetching activity feed: %s", e)
+            return json_response({
+                'success': False,
+                'error': 'Failed to fetch activity feed'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error fetching activity feed: {str(e)}")
-            return JsonResponse({
+            logger.error("Error fetching activity feed: %s", e)
+            return json_response({
                 'success': False,
                 'error': 'Failed to fetch activity feed'
             }, status=500)
     
-    def _serialize_feed_item(self, content, user):
+    def _empty_feed_response(self, request, page, page_size):
+        """Empty feed in the same shape as the page or cursor response"""
+        if 'cursor' in request.GET:
+            pagination = {
+                'page_size': page_size,
+                'has_next': False,
+                'next_cursor': None,
+            }
+        else:
+            pagination = {
+                'page': page,
+                'page_size': page_size,
+                'total_pages': 1,
+                'total_items': 0,
+                'has_next': False,
+                'has_previous': False,
+                'next_cursor': None,
+            }
+        
+        return json_response({
+            'success': True,
+            'feed': [],
+            'pagination': pagination
+        })
+    
+    def _get_cursor_page(self, query, cursor, page_size):
+        """Keyset pagination: seek past the cursor instead of OFFSET, and skip COUNT(*)"""
+        if cursor:
+            try:
+                score, published_at, content_id = _decode_feed_cursor(cursor)
+            except ValueError:
+                return json_response({
+                    'success': False,
+                    'error': 'Invalid cursor'
+                }, status=400)
+            
+            query = query.filter(
+                Q(engagement_score__lt=score) |
+                Q(engagement_score=score, published_at__lt=published_at) |
+                Q(engagement_score=score, published_at=published_at, id__lt=content_id)
+            )
+        
+        # Fetch one extra row to learn whether another page exists
+        contents = list(query[:page_size + 1])
+        has_next = len(contents) > page_size
+        contents = contents[:page_size]
+        
+        return json_response({
+            'success': True,
+            'feed': self._serialize_feed_page(contents),
+            'pagination': {
+                'page_size': page_size,
+                'has_next': has_next,
+                'next_cursor': _encode_feed_cursor(contents[-1]) if has_next else None,
+            }
+        })
+    
+    def _serialize_feed_page(self, contents):
+        """Serialize a list of feed items, reusing cached entries (items are viewer-independent)"""
+        keys = [_feed_item_cache_key(content) for content in contents]
+        cached = cache.get_many(keys)
+        
+        feed_data = []
+        missing = {}
+        for key, content in zip(keys, contents):
+            item = cached.get(key)
+            if item is None:
+                item = missing[key] = self._serialize_feed_item(content)
+            feed_data.append(item)
+        
+        if missing:
+            cache.set_many(missing, FEED_ITEM_CACHE_TIMEOUT)
+        return feed_data
+    
+    def _serialize_feed_item(self, content):
         """Serialize content for feed"""
+        (
+            content_id, content_type, title, summary, featured_image,
+            author_id, author_username, author_full_name,
+            views, likes, shares, comments_count, engagement_score,
+            published_at, is_pinned, is_featured,
+        ) = _FEED_ITEM_ATTRS(content)
         return {
-            'id': content.id,
-            'content_type': content.content_type,
-            'title': content.title,
-            'summary': content.summary,
-            'featured_image': content.featured_image,
+            'id': content_id,
+            'content_type': content_type,
+            'title': title,
+            'summary': summary,
+            'featured_image': featured_image,
             'author': {
-                'id': content.author.id,
-                'username': content.author.username,
-                'full_name': getattr(content.author, 'full_name', ''),
+                'id': author_id,
+                'username': author_username,
+                'full_name': author_full_name,
             },
             'engagement': {
-                'views': content.views,
-                'likes': content.likes,
-                'shares': content.shares,
-                'comments_count': content.comments_count,
-                'engagement_score': content.engagement_score,
+                'views': views,
+                'likes': likes,
+                'shares': shares,
+                'comments_count': comments_count,
+                'engagement_score': engagement_score,
             },
-            'published_at': content.published_at.isoformat(),
-            'is_pinned': content.is_pinned,
-            'is_featured': content.is_featured,
+            'published_at': published_at,
+            'is_pinned': is_pinned,
+            'is_featured': is_featured,
+        }
+
+def _rollup_content_analytics(type_rows):
+    """Combine per-content-type aggregate rows into overall content totals"""
+    if not type_rows:
+        return {
+            'total_content': 0,
+            'total_views': None,
+            'total_likes': None,
+            'total_shares': None,
+            'total_comments': None,
+            'avg_engagement': None,
         }
+    
+    total_content = sum(row['count'] for row in type_rows)
+    return {
+        'total_content': total_content,
+        'total_views': sum(row['total_views'] for row in type_rows),
+        'total_likes': sum(row['total_likes'] for row in type_rows),
+        'total_shares': sum(row['total_shares'] for row in type_rows),
+        'total_comments': sum(row['total_comments'] for row in type_rows),
+        'avg_engagement': sum(row['total_engagement'] for row in type_rows) / total_content,
+    }
 
 @require_http_methods(["GET"])
 def get_content_analytics(request):
     """Get content analytics for user"""
     if not request.user.is_authenticated:
-        return JsonResponse({
+        return json_response({
             'success': False,
             'error': 'Authentication required'
         }, status=401)
@@ -910,24 +1174,28 @@ def get_content_analytics(request):
     try:
         profile = request.user.clawedin_profile
         
-        # Get content analytics
-        content_analytics = ProfessionalContent.objects.filter(author=request.user).aggregate(
-            total_content=Count('id'),
+        # Content type breakdown; overall totals are rolled up from the same scan
+        type_rows = list(ProfessionalContent.objects.filter(
+            author=request.user
+        ).values('content_type').annotate(
+            count=Count('id'),
             total_views=Sum('views'),
             total_likes=Sum('likes'),
             total_shares=Sum('shares'),
             total_comments=Sum('comments_count'),
-            avg_engagement=Avg('engagement_score')
-        )
+            total_engagement=Sum('engagement_score')
+        ).order_by('content_type'))
         
-        # Content type breakdown
-        content_by_type = ProfessionalContent.objects.filter(
-            author=request.user
-        ).values('content_type').annotate(
-            count=Count('id'),
-            total_views=Sum('views'),
-            total_likes=Sum('likes')
-        )
+        content_analytics = _rollup_content_analytics(type_rows)
+        content_by_type = [
+            {
+                'content_type': row['content_type'],
+                'count': row['count'],
+                'total_views': row['total_views'],
+                'total_likes': row['total_likes'],
+            }
+            for row in type_rows
+        ]
         
         # Achievement analytics
         achievement_analytics = ProfessionalAchievement.objects.filter(profile=profile).aggregate(
@@ -943,19 +1211,25 @@ def get_content_analytics(request):
             completed_projects=Count('id', filter=Q(status='completed'))
         )
         
-        return JsonResponse({
+        return json_response({
             'success': True,
             'analytics': {
                 'content': content_analytics,
-                'content_by_type': list(content_by_type),
+                'content_by_type': content_by_type,
                 'achievements': achievement_analytics,
                 'projects': project_analytics,
             }
         })
         
+    except DatabaseError as e:
+        logger.error("Database error fetching content analytics: %s", e)
+        return json_response({
+            'success': False,
+            'error': 'Failed to fetch analytics'
+        }, status=503)
     except Exception as e:
-        logger.error(f"Error fetching content analytics: {str(e)}")
-        return JsonResponse({
+        logger.error("Error fetching content analytics: %s", e)
+        return json_response({
             'success': False,
             'error': 'Failed to fetch analytics'
         }, status=500)
\ No newline at end of file
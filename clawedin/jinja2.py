@@ -1,13 +1,21 @@
 """
 Jinja2 environment configuration for template rendering
 """
+from functools import cache, lru_cache
+import hashlib
+import marshal
+import sys
+
+import jinja2
 from jinja2 import Environment
+from jinja2.sandbox import ImmutableSandboxedEnvironment
+from django.core.cache import caches
 from django.templatetags.static import static
 from django.urls import reverse
 
-def environment(**options):
+def environment(environment_class=Environment, **options):
     """Configure Jinja2 environment with custom filters and globals"""
-    env = Environment(**options)
+    env = environment_class(**options)
     
     # Add Django-specific globals
     env.globals.update({
@@ -22,6 +30,59 @@ def environment(**options):
     
     return env
 
+@cache
+def profile_environment():
+    """Process-wide Jinja2 environment for database-stored profile templates.
+
+    Profile templates are compiled from strings rather than loaded from disk,
+    so file reloading is disabled and the template cache is unbounded. They
+    are stored in the database, so they run sandboxed: no unsafe attribute
+    access and no mutation of context objects.
+    """
+    return environment(
+        ImmutableSandboxedEnvironment,
+        autoescape=True,
+        cache_size=-1,
+        auto_reload=False
+    )
+
+# Compiled profile template code is kept for a day in the template_bytecode
+# cache, a database-backed alias every worker and host can reach
+PROFILE_BYTECODE_CACHE_TIMEOUT = 60 * 60 * 24
+
+def _profile_bytecode_key(source):
+    """Cache key for compiled template code; marshal output is tied to the
+    Python and Jinja versions, so both are part of the key"""
+    digest = hashlib.sha256(source.encode()).hexdigest()
+    python_version = '.'.join(map(str, sys.version_info[:2]))
+    return f"jinja2-bytecode:{python_version}:{jinja2.__version__}:{digest}"
+
+@lru_cache(maxsize=256)
+def compile_profile_template(source):
+    """Compile a profile template source string once and reuse the result.
+    
+    Within a process the LRU cache returns the template object. The
+    compiled code object is also stored in the shared template_bytecode
+    cache, so other workers, hosts and restarts skip lexing, parsing and
+    code generation.
+    """
+    env = profile_environment()
+    key = _profile_bytecode_key(source)
+    
+    code = None
+    bytecode_cache = caches['template_bytecode']
+    data = bytecode_cache.get(key)
+    if data is not None:
+        try:
+            code = marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            code = None
+    if code is None:
+        code = env.compile(source)
+        bytecode_cache.set(key, marshal.dumps(code), PROFILE_BYTECODE_CACHE_TIMEOUT)
+    
+    return env.template_class.from_code(env, code, env.make_globals(None))
+
 def truncate_words(value, length=50):
     """Truncate text to specified number of words"""
     if not value:
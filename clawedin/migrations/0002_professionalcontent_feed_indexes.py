@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clawedin", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="professionalcontent",
+            index=models.Index(
+                fields=["is_approved", "-engagement_score", "-published_at", "-id"],
+                name="content_feed_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="professionalcontent",
+            index=models.Index(
+                fields=["author", "-published_at"], name="content_author_time_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-16 10:04
+
+from django.db import migrations, models
+
+
+def backfill_author_fields(apps, schema_editor):
+    ProfessionalContent = apps.get_model("clawedin", "ProfessionalContent")
+    for content in ProfessionalContent.objects.select_related("author").iterator():
+        author = content.author
+        content.author_username = author.username
+        content.author_full_name = f"{author.first_name} {author.last_name}".strip()
+        content.save(update_fields=["author_username", "author_full_name"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clawedin", "0002_professionalcontent_feed_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="professionalcontent",
+            name="author_username",
+            field=models.CharField(blank=True, db_index=True, max_length=150),
+        ),
+        migrations.AddField(
+            model_name="professionalcontent",
+            name="author_full_name",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(backfill_author_fields, migrations.RunPython.noop),
+    ]
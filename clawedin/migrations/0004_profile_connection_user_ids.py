@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-16 11:20
+
+from django.db import migrations, models
+
+
+def backfill_connection_user_ids(apps, schema_editor):
+    Profile = apps.get_model("clawedin", "Profile")
+    for profile in Profile.objects.prefetch_related("top_connections").iterator(chunk_size=500):
+        profile.connection_user_ids = sorted(
+            connection.user_id for connection in profile.top_connections.all()
+        )
+        profile.save(update_fields=["connection_user_ids"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clawedin", "0003_professionalcontent_author_denormalized"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="connection_user_ids",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="User ids of top connections, kept in sync for feed lookups",
+            ),
+        ),
+        migrations.RunPython(backfill_connection_user_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-16 14:05
+
+from django.db import migrations, models
+
+
+def build_rendered_default_css(apps, schema_editor):
+    from clawedin.utils import default_renderer
+
+    ProfileTemplate = apps.get_model("clawedin", "ProfileTemplate")
+    templates = list(ProfileTemplate.objects.all())
+    for template in templates:
+        template.rendered_default_css = default_renderer.render_default_css(template)
+    ProfileTemplate.objects.bulk_update(templates, ["rendered_default_css"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clawedin", "0004_profile_connection_user_ids"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profiletemplate",
+            name="rendered_default_css",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="css_template rendered and validated without customizations",
+            ),
+        ),
+        migrations.RunPython(build_rendered_default_css, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0.1 on 2026-10-16 15:40
+
+from django.db import migrations, models
+
+
+THEME_CSS_VARIABLE_FIELDS = {
+    "--primary-color": "primary_color",
+    "--secondary-color": "secondary_color",
+    "--background-color": "background_color",
+    "--text-color": "text_color",
+    "--accent-color": "accent_color",
+    "--font-family": "font_family",
+    "--heading-font": "heading_font",
+    "--border-radius": "border_radius",
+    "--shadow-style": "shadow_style",
+}
+
+
+def build_rendered_css_variables(apps, schema_editor):
+    ProfileTheme = apps.get_model("clawedin", "ProfileTheme")
+    themes = list(ProfileTheme.objects.all())
+    for theme in themes:
+        theme.rendered_css_variables = {
+            prop: getattr(theme, field) for prop, field in THEME_CSS_VARIABLE_FIELDS.items()
+        }
+    ProfileTheme.objects.bulk_update(themes, ["rendered_css_variables"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clawedin", "0005_profiletemplate_rendered_default_css"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profiletheme",
+            name="rendered_css_variables",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Palette and typography CSS custom properties, built on save",
+            ),
+        ),
+        migrations.RunPython(build_rendered_css_variables, migrations.RunPython.noop),
+    ]
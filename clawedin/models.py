@@ -1,10 +1,122 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.validators import RegexValidator
+from django.utils.functional import cached_property
+from collections import OrderedDict
+from types import MappingProxyType
+from datetime import date
+import hashlib
 import json
+import threading
+import uuid
+import tinycss2
 
 User = get_user_model()
 
+# CSS properties rejected in profile custom CSS
+DISALLOWED_CSS_PROPERTIES = (
+    'position: fixed', 'position: absolute',
+    'z-index', 'overflow', 'cursor: pointer',
+    'animation', 'transition',
+)
+
+# (property name, banned value or None for any value, entry) per property
+_DISALLOWED_CSS_CHECKS = tuple(
+    (name.strip(), value.strip() or None, prop)
+    for prop in DISALLOWED_CSS_PROPERTIES
+    for name, _, value in [prop.partition(':')]
+)
+
+# Vendor-prefixed properties are checked as their standard name
+CSS_VENDOR_PREFIXES = ('-webkit-', '-moz-', '-ms-', '-o-')
+
+def _disallowed_css_property(name, value):
+    """Return the DISALLOWED_CSS_PROPERTIES entry a declaration breaks, if any"""
+    for prefix in CSS_VENDOR_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    for banned_name, banned_value, prop in _DISALLOWED_CSS_CHECKS:
+        # Longhands such as overflow-x fall under their shorthand
+        if name != banned_name and not name.startswith(banned_name + '-'):
+            continue
+        if banned_value is None or value == banned_value:
+            return prop
+    return None
+
+def _find_disallowed_css_property(nodes):
+    """Walk parsed declarations and nested blocks for a disallowed property"""
+    for node in nodes:
+        if node.type == 'declaration':
+            value = tinycss2.serialize(node.value).strip().lower()
+            prop = _disallowed_css_property(node.lower_name, value)
+        elif node.type in ('qualified-rule', 'at-rule') and node.content is not None:
+            prop = _find_disallowed_css_property(tinycss2.parse_blocks_contents(
+                node.content, skip_comments=True, skip_whitespace=True
+            ))
+        else:
+            continue
+        if prop:
+            return prop
+    return None
+
+# Validation results are memoized per digest of the CSS, never the CSS itself;
+# only inputs up to the max length are memoized
+CSS_VALIDATION_MEMO_SIZE = 1024
+CSS_VALIDATION_MEMO_MAX_LENGTH = 64 * 1024
+_css_validation_memo = OrderedDict()
+_css_validation_memo_lock = threading.Lock()
+
+def _check_css_professional_standards(css_code):
+    # Top-level declarations are accepted as well as rules, and comments
+    # are skipped rather than scanned
+    prop = _find_disallowed_css_property(tinycss2.parse_blocks_contents(
+        css_code, skip_comments=True, skip_whitespace=True
+    ))
+    if prop:
+        return False, f"Property '{prop}' not allowed in professional profiles"
+    
+    return True, "CSS meets professional standards"
+
+def validate_css_professional_standards(css_code):
+    """Validate CSS meets professional standards, returning (is_valid, message)"""
+    if len(css_code) > CSS_VALIDATION_MEMO_MAX_LENGTH:
+        return _check_css_professional_standards(css_code)
+    
+    # Users resubmit the same CSS while editing
+    digest = hashlib.blake2b(css_code.encode(), digest_size=16).digest()
+    with _css_validation_memo_lock:
+        result = _css_validation_memo.get(digest)
+        if result is not None:
+            _css_validation_memo.move_to_end(digest)
+            return result
+    
+    result = _check_css_professional_standards(css_code)
+    with _css_validation_memo_lock:
+        _css_validation_memo[digest] = result
+        if len(_css_validation_memo) > CSS_VALIDATION_MEMO_SIZE:
+            _css_validation_memo.popitem(last=False)
+    return result
+
+# CSS custom property emitted for each ProfileTheme field
+THEME_CSS_VARIABLE_FIELDS = MappingProxyType({
+    '--primary-color': 'primary_color',
+    '--secondary-color': 'secondary_color',
+    '--background-color': 'background_color',
+    '--text-color': 'text_color',
+    '--accent-color': 'accent_color',
+    '--font-family': 'font_family',
+    '--heading-font': 'heading_font',
+    '--border-radius': 'border_radius',
+    '--shadow-style': 'shadow_style',
+})
+
+# How long template and theme summaries stay in the shared cache; saves and
+# deletes drop them sooner, the timeout bounds staleness after a rename
+CATALOG_INFO_CACHE_TIMEOUT = 300
+
 class ProfileTemplate(models.TextChoices):
     """Professional profile templates with creative elements"""
     
@@ -121,6 +233,11 @@ class Profile(models.Model):
         blank=True,
         help_text="Top 8 professional connections"
     )
+    connection_user_ids = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="User ids of top connections, kept in sync for feed lookups"
+    )
     
     # Professional Status
     is_open_to_work = models.BooleanField(default=False)
@@ -168,12 +285,57 @@ class Profile(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.headline}"
     
+    # Per-instance memoized values, dropped whenever the row is saved or reloaded
+    _CACHED_PROPERTIES = ('_full_profile_url', '_professional_summary')
+    
+    # Written only by the connection signal handlers, so a stale instance
+    # saving every field cannot overwrite them
+    SIGNAL_MANAGED_FIELDS = frozenset({'connection_user_ids'})
+    
+    def save(self, *args, **kwargs):
+        for name in self._CACHED_PROPERTIES:
+            self.__dict__.pop(name, None)
+        if kwargs.get('update_fields') is None and not self._state.adding and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.SIGNAL_MANAGED_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+    
+    def refresh_from_db(self, *args, **kwargs):
+        for name in self._CACHED_PROPERTIES:
+            self.__dict__.pop(name, None)
+        super().refresh_from_db(*args, **kwargs)
+    
+    @cached_property
+    def _full_profile_url(self):
+        return f"/profile/{self.user.username}/"
+    
     def get_full_profile_url(self):
         """Get full profile URL for sharing"""
-        return f"/profile/{self.user.username}/"
+        return self._full_profile_url
+    
+    @classmethod
+    def load_for_render(cls, **lookup):
+        """Fetch a profile with everything the template renderer reads prefetched"""
+        return cls.objects.select_related('user').prefetch_related(
+            'experiences',
+            'education',
+            'skills',
+            models.Prefetch(
+                'top_connections',
+                queryset=cls.objects.select_related('user').order_by('-updated_at')
+            ),
+        ).get(**lookup)
     
     def get_top_connections_ordered(self):
         """Get top 8 connections ordered by relationship strength"""
+        if 'top_connections' in getattr(self, '_prefetched_objects_cache', {}):
+            # load_for_render prefetches connections in this order already
+            return self.top_connections.all()[:8]
         return self.top_connections.select_related('user').order_by('-updated_at')[:8]
     
     def add_top_connection(self, profile_user):
@@ -184,25 +346,17 @@ class Profile(models.Model):
             self.top_connections.remove(oldest)
         self.top_connections.add(profile_user)
     
-    def get_professional_summary(self):
-        """Generate professional summary with creative elements"""
+    @cached_property
+    def _professional_summary(self):
         experience_text = f"{self.years_experience}+ years" if self.years_experience > 0 else "Entry level"
         return f"{self.headline} • {experience_text} • {self.current_company or 'Independent'}"
     
-    def validate_css_professional_standards(self, css_code):
-        """Validate CSS meets professional standards"""
-        disallowed_properties = [
-            'position: fixed', 'position: absolute',
-            'z-index', 'overflow', 'cursor: pointer',
-            'animation', 'transition'
-        ]
-        
-        css_lower = css_code.lower()
-        for prop in disallowed_properties:
-            if prop in css_lower:
-                return False, f"Property '{prop}' not allowed in professional profiles"
-        
-        return True, "CSS meets professional standards"
+    def get_professional_summary(self):
+        """Generate professional summary with creative elements"""
+        return self._professional_summary
+    
+    # Exposed on the model for callers that hold a Profile; needs no instance
+    validate_css_professional_standards = staticmethod(validate_css_professional_standards)
     
     def clean(self):
         """Validate profile data"""
@@ -278,7 +432,6 @@ class Experience(models.Model):
     def get_duration_display(self):
         """Get human-readable duration"""
         if self.is_current or not self.end_date:
-            from datetime import date
             duration = date.today() - self.start_date
             months = duration.days // 30
             years = months // 12
@@ -419,6 +572,11 @@ class ProfileTemplate(models.Model):
     # Template Content
     html_template = models.TextField(help_text="Jinja2 template for profile rendering")
     css_template = models.TextField(help_text="Base CSS for template")
+    rendered_default_css = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="css_template rendered and validated without customizations"
+    )
     
     # Customization Options
     customization_options = models.JSONField(
@@ -447,16 +605,47 @@ class ProfileTemplate(models.Model):
     def __str__(self):
         return self.display_name
     
+    # The CSS context exposes the whole template, so only these fields leave
+    # rendered_default_css valid when they are the only ones saved
+    NON_CSS_CONTEXT_FIELDS = frozenset({'rendered_default_css', 'created_at', 'updated_at'})
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) - self.NON_CSS_CONTEXT_FIELDS:
+            from .utils import default_renderer
+            
+            # Render the uncustomized CSS now so plain profile views can skip it;
+            # a failed render stores '' and render_css falls back per request
+            self.rendered_default_css = default_renderer.render_default_css(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'rendered_default_css'}
+        super().save(*args, **kwargs)
+    
     def increment_usage(self):
-        """Increment template usage count"""
+        """Increment template usage count in the database without reading the row"""
+        ProfileTemplate.objects.filter(pk=self.pk).update(usage_count=models.F('usage_count') + 1)
         self.usage_count += 1
-        self.save(update_fields=['usage_count'])
+    
+    @staticmethod
+    def info_cache_key(name):
+        return f"template-info:{name}"
+    
+    @classmethod
+    def load_customization_info(cls, name):
+        """Customization summary for the named template, or None"""
+        return cls.objects.filter(name=name).values(
+            'id', 'name', 'display_name', 'category',
+            'template_type', 'customization_options',
+        ).first()
+    
+    @classmethod
+    def get_customization_info(cls, name):
+        """Customization summary for the named template, shared through the cache"""
+        return get_catalog_infos((cls, name))[0]
     
     def get_rendered_html(self, profile, customizations=None):
         """Render HTML template with profile data"""
-        from django.template import engines
-        from django.template.loader import get_template
-        from django.template import Context
+        from .jinja2 import compile_profile_template
         
         # Prepare template context
         context_data = {
@@ -466,18 +655,16 @@ class ProfileTemplate(models.Model):
         }
         
         # Create Jinja2 template
-        jinja_env = engines['jinja2'].env
-        template = jinja_env.from_string(self.html_template)
+        template = compile_profile_template(self.html_template)
         
         return template.render(**context_data)
     
     def get_rendered_css(self, customizations=None):
         """Render CSS with customizations"""
-        from django.template import engines
+        from .jinja2 import compile_profile_template
         
         # Create Jinja2 template
-        jinja_env = engines['jinja2'].env
-        template = jinja_env.from_string(self.css_template)
+        template = compile_profile_template(self.css_template)
         
         return template.render(
             template=self,
@@ -519,6 +706,12 @@ class ProfileTheme(models.Model):
     
     # Theme CSS
     css_variables = models.JSONField(default=dict, help_text="CSS custom properties")
+    rendered_css_variables = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Palette and typography CSS custom properties, built on save"
+    )
     full_css = models.TextField(help_text="Complete theme CSS")
     
     # Usage
@@ -542,20 +735,170 @@ class ProfileTheme(models.Model):
         return self.display_name
     
     def increment_usage(self):
-        """Increment theme usage count"""
+        """Increment theme usage count in the database without reading the row"""
+        ProfileTheme.objects.filter(pk=self.pk).update(usage_count=models.F('usage_count') + 1)
         self.usage_count += 1
-        self.save(update_fields=['usage_count'])
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or not set(update_fields).isdisjoint(THEME_CSS_VARIABLE_FIELDS.values()):
+            # Materialize the custom properties so applying a theme only reads them
+            self.rendered_css_variables = {
+                prop: getattr(self, field) for prop, field in THEME_CSS_VARIABLE_FIELDS.items()
+            }
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'rendered_css_variables'}
+        self.__dict__.pop('_css_variable_map', None)
+        super().save(*args, **kwargs)
+    
+    @staticmethod
+    def info_cache_key(name):
+        return f"theme-info:{name}"
+    
+    @classmethod
+    def load_customization_info(cls, name):
+        """Palette summary for the named theme, or None"""
+        theme = cls.objects.filter(name=name).values(
+            'id', 'display_name', 'theme_type', 'primary_color',
+            'secondary_color', 'background_color', 'text_color', 'accent_color',
+        ).first()
+        return theme and {
+            'id': theme['id'],
+            'display_name': theme['display_name'],
+            'theme_type': theme['theme_type'],
+            'color_palette': {
+                'primary': theme['primary_color'],
+                'secondary': theme['secondary_color'],
+                'background': theme['background_color'],
+                'text': theme['text_color'],
+                'accent': theme['accent_color'],
+            },
+        }
+    
+    @classmethod
+    def get_customization_info(cls, name):
+        """Palette summary for the named theme, shared through the cache"""
+        return get_catalog_infos((cls, name))[0]
+    
+    def refresh_from_db(self, *args, **kwargs):
+        self.__dict__.pop('_css_variable_map', None)
+        super().refresh_from_db(*args, **kwargs)
+    
+    @cached_property
+    def _css_variable_map(self):
+        """Read-only CSS custom properties, built once per instance"""
+        # Rows written without save() (fixtures, bulk_create) have nothing stored
+        if self.rendered_css_variables:
+            return MappingProxyType(self.rendered_css_variables)
+        return MappingProxyType({
+            prop: getattr(self, field) for prop, field in THEME_CSS_VARIABLE_FIELDS.items()
+        })
     
     def to_css_variables(self):
         """Convert theme to CSS custom properties"""
-        return {
-            '--primary-color': self.primary_color,
-            '--secondary-color': self.secondary_color,
-            '--background-color': self.background_color,
-            '--text-color': self.text_color,
-            '--accent-color': self.accent_color,
-            '--font-family': self.font_family,
-            '--heading-font': self.heading_font,
-            '--border-radius': self.border_radius,
-            '--shadow-style': self.shadow_style,
-        }
\ No newline at end of file
+        return self._css_variable_map
+
+
+# =============================================================================
+# Signal handlers for denormalized connection ids
+# =============================================================================
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+
+def refresh_connection_user_ids(profile_ids):
+    """Recompute connection_user_ids for the given profiles"""
+    for profile in Profile.objects.filter(id__in=profile_ids).prefetch_related('top_connections'):
+        user_ids = sorted(connection.user_id for connection in profile.top_connections.all())
+        if user_ids != profile.connection_user_ids:
+            # Bumping updated_at also expires cached renders of the profile
+            Profile.objects.filter(id=profile.id).update(
+                connection_user_ids=user_ids,
+                updated_at=timezone.now()
+            )
+
+
+@receiver(m2m_changed, sender=Profile.top_connections.through)
+def sync_connection_user_ids(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep connection_user_ids in step with top_connections changes"""
+    if action == 'pre_clear' and reverse:
+        # Remember which profiles featured this one before the rows disappear
+        instance._featured_in_ids = list(instance.featured_in.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    if not reverse:
+        refresh_connection_user_ids([instance.id])
+        instance.refresh_from_db(fields=['connection_user_ids', 'updated_at'])
+    elif action == 'post_clear':
+        refresh_connection_user_ids(getattr(instance, '_featured_in_ids', []))
+    else:
+        refresh_connection_user_ids(pk_set or [])
+
+
+@receiver(pre_delete, sender=Profile)
+def remember_featuring_profiles(sender, instance, **kwargs):
+    """Record which profiles feature this one before the deletion drops the links"""
+    instance._featured_in_ids = list(instance.featured_in.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Profile)
+def prune_deleted_connection(sender, instance, **kwargs):
+    """Drop a deleted profile's user id from the profiles that featured it"""
+    refresh_connection_user_ids(getattr(instance, '_featured_in_ids', []))
+
+
+# =============================================================================
+# Signal handlers for rendered profile cache invalidation
+# =============================================================================
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def touch_profile_on_section_change(sender, instance, **kwargs):
+    """Bump the owning profile's updated_at so cached renders miss"""
+    Profile.objects.filter(id=instance.profile_id).update(updated_at=timezone.now())
+
+
+def get_catalog_infos(*lookups):
+    """Cached summaries for (model, name) pairs, in order.
+    
+    All entries are read in one cache round trip and misses are loaded and
+    written back in another; unknown names are cached as None.
+    """
+    keys = [model.info_cache_key(name) for model, name in lookups]
+    infos = cache.get_many(keys)
+    missing = {
+        key: model.load_customization_info(name)
+        for key, (model, name) in zip(keys, lookups)
+        if key not in infos
+    }
+    if missing:
+        cache.set_many(missing, CATALOG_INFO_CACHE_TIMEOUT)
+        infos.update(missing)
+    return [infos[key] for key in keys]
+
+def _catalog_version_key(model):
+    return f"catalog-version:{model._meta.model_name}"
+
+def catalog_version(model):
+    """Token that changes whenever a row of the given catalog model is saved or deleted"""
+    return cache.get_or_set(_catalog_version_key(model), lambda: uuid.uuid4().hex, None)
+
+
+# =============================================================================
+# Signal handlers for cached template and theme summaries
+# =============================================================================
+
+@receiver(post_save, sender=ProfileTemplate)
+@receiver(post_delete, sender=ProfileTemplate)
+@receiver(post_save, sender=ProfileTheme)
+@receiver(post_delete, sender=ProfileTheme)
+def drop_cached_catalog_info(sender, instance, **kwargs):
+    """Expire the cached summary stored under the saved or deleted name"""
+    cache.delete_many([sender.info_cache_key(instance.name), _catalog_version_key(sender)])
@@ -121,6 +121,31 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# The default cache sits on the hot path (feeds, rendered profiles, catalog
+# listings), so it stays in memory unless CACHE_BACKEND points it at Redis or
+# Memcached. Compiled profile template code is shared between workers and
+# hosts through its own database-backed alias (run `manage.py createcachetable`).
+
+cache_backend = os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+cache_location = os.environ.get("CACHE_LOCATION", "")
+
+CACHES = {
+    "default": {
+        "BACKEND": cache_backend,
+        "LOCATION": cache_location,
+    },
+    "template_bytecode": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "clawedin_template_bytecode",
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
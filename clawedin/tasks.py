@@ -0,0 +1,19 @@
+"""
+Background tasks for the clawedin app
+"""
+from django.contrib.auth import get_user_model
+from django.tasks import task
+
+from .content_models import ProfessionalProject
+
+User = get_user_model()
+
+@task
+def set_project_collaborators(project_id, collaborator_ids):
+    """Replace a project's collaborators with the given users"""
+    try:
+        project = ProfessionalProject.objects.get(id=project_id)
+    except ProfessionalProject.DoesNotExist:
+        return
+    
+    project.collaborators.set(User.objects.filter(id__in=collaborator_ids))
@@ -1,17 +1,261 @@
-from django.template import engines
+from django.core.cache import cache
+from django.http import HttpResponse
 from django.template.loader import render_to_string
-from django.utils.safestring import mark_safe
-from bs4 import BeautifulSoup
-import re
+from django.utils.functional import SimpleLazyObject
+from django.utils.html import format_html
+from jinja2 import pass_context
+from markupsafe import Markup
+from .jinja2 import compile_profile_template, profile_environment
+from datetime import date
+from decimal import Decimal
+from functools import wraps
+from types import MappingProxyType
+import hashlib
+import nh3
+import orjson
+import tinycss2
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sample data used by TemplateEngine.preview_template
+SAMPLE_PROFILE_FIELDS = MappingProxyType({
+    'headline': "Sample Professional Profile",
+    'summary': "This is a sample profile to preview the template design and layout.",
+    'current_company': "Sample Company",
+    'current_position': "Sample Position",
+    'industry': "Technology",
+    'location': "San Francisco, CA",
+    'years_experience': 5,
+    'skills_list': ("Python", "Django", "JavaScript", "UI/UX Design"),
+})
+
+# HTML allowed through the profile sanitizer; everything else is stripped
+ALLOWED_HTML_TAGS = frozenset({
+    'a', 'abbr', 'article', 'aside', 'b', 'blockquote', 'br', 'code', 'dd',
+    'div', 'dl', 'dt', 'em', 'figcaption', 'figure', 'footer', 'h1', 'h2',
+    'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'i', 'img', 'li', 'main', 'nav',
+    'ol', 'p', 'pre', 'section', 'small', 'span', 'strong', 'sub', 'sup',
+    'table', 'tbody', 'td', 'th', 'thead', 'time', 'tr', 'u', 'ul',
+})
+ALLOWED_HTML_ATTRIBUTES = {
+    '*': {'class', 'id', 'title'},
+    'a': {'href'},
+    'img': {'src', 'alt'},
+}
+# Built once so the allowlists are not converted again on every render
+_HTML_CLEANER = nh3.Cleaner(
+    tags=ALLOWED_HTML_TAGS,
+    attributes=ALLOWED_HTML_ATTRIBUTES,
+    strip_comments=False,
+)
+
+# Declarations dropped from rendered template CSS: property name mapped to
+# the values that are disallowed, or None to drop the property (and its
+# longhands) whatever the value
+DISALLOWED_CSS_DECLARATIONS = MappingProxyType({
+    'position': frozenset({'fixed', 'absolute'}),
+    'overflow': frozenset({'hidden'}),
+    'cursor': frozenset({'pointer'}),
+    'z-index': None,
+    'animation': None,
+    'transition': None,
+    'transform': None,
+})
+_DISALLOWED_CSS_PREFIXES = tuple(
+    f'{name}-' for name, values in DISALLOWED_CSS_DECLARATIONS.items() if values is None
+)
+_DISALLOWED_CSS_VALUE_MARKERS = ('javascript:', 'expression(')
+# -webkit-transform and friends are blocked like the unprefixed property
+_CSS_VENDOR_PREFIXES = ('-webkit-', '-moz-', '-ms-', '-o-')
+# At-rules whose block holds nested rules rather than declarations
+_NESTED_CSS_AT_RULES = frozenset({'media', 'supports', 'layer', 'container'})
+
+def _is_disallowed_declaration(name, value):
+    """Check one declaration (lowercased name, serialized value) against the blocklist"""
+    lowered = value.lower()
+    if any(marker in lowered for marker in _DISALLOWED_CSS_VALUE_MARKERS):
+        return True
+    if name.startswith(_CSS_VENDOR_PREFIXES):
+        name = name[name.index('-', 1) + 1:]
+    if name.startswith(_DISALLOWED_CSS_PREFIXES):
+        return True
+    if name not in DISALLOWED_CSS_DECLARATIONS:
+        return False
+    values = DISALLOWED_CSS_DECLARATIONS[name]
+    return values is None or lowered in values
+
+def _has_invalid_css_token(tokens):
+    """Check for tokens the parser could not make sense of, such as bad url()s"""
+    for token in tokens:
+        if token.type in ('bad-url', 'error'):
+            return True
+        if token.type == 'function' and _has_invalid_css_token(token.arguments):
+            return True
+    return False
+
+def _clean_css_declarations(content):
+    """Serialize the allowed declarations of a block, one per line"""
+    lines = []
+    for node in tinycss2.parse_declaration_list(content, skip_comments=True, skip_whitespace=True):
+        if node.type != 'declaration' or _has_invalid_css_token(node.value):
+            continue
+        value = tinycss2.serialize(node.value).strip()
+        if _is_disallowed_declaration(node.lower_name, value):
+            continue
+        important = ' !important' if node.important else ''
+        lines.append(f'    {node.name}: {value}{important};\n')
+    return ''.join(lines)
+
+def _clean_css_rules(rules):
+    """Serialize a rule list, dropping disallowed declarations and @import"""
+    parts = []
+    for rule in rules:
+        if rule.type == 'qualified-rule':
+            prelude = tinycss2.serialize(rule.prelude).strip()
+            parts.append(f'{prelude} {{\n{_clean_css_declarations(rule.content)}}}\n')
+        elif rule.type == 'at-rule':
+            keyword = rule.lower_at_keyword
+            prelude = tinycss2.serialize(rule.prelude).strip()
+            if keyword == 'import' or _has_invalid_css_token(rule.prelude) or any(
+                marker in prelude.lower() for marker in _DISALLOWED_CSS_VALUE_MARKERS
+            ):
+                continue
+            head = f'@{rule.at_keyword} {prelude}' if prelude else f'@{rule.at_keyword}'
+            if rule.content is None:
+                parts.append(f'{head};\n')
+            elif keyword in _NESTED_CSS_AT_RULES:
+                nested = tinycss2.parse_rule_list(rule.content, skip_comments=True, skip_whitespace=True)
+                parts.append(f'{head} {{\n{_clean_css_rules(nested)}}}\n')
+            else:
+                parts.append(f'{head} {{\n{_clean_css_declarations(rule.content)}}}\n')
+    return ''.join(parts)
+
+# Static fragments of the complete profile document
+DOCUMENT_HEAD = (
+    '<!DOCTYPE html>\n'
+    '<html lang="en">\n'
+    '<head>\n'
+    '    <meta charset="UTF-8">\n'
+    '    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+    '    <title>'
+)
+DOCUMENT_STYLE_OPEN = ' - Professional Profile</title>\n    <style>\n'
+DOCUMENT_BODY_OPEN = '\n    </style>\n</head>\n<body>\n    <div class="profile-container">\n'
+DOCUMENT_TAIL = '\n    </div>\n</body>\n</html>\n'
+
+# Badge markup per skill proficiency level, marked safe for the autoescaping environment
+SKILL_LEVEL_BADGES = MappingProxyType({
+    'beginner': Markup('<span class="skill-badge beginner">Beginner</span>'),
+    'intermediate': Markup('<span class="skill-badge intermediate">Intermediate</span>'),
+    'advanced': Markup('<span class="skill-badge advanced">Advanced</span>'),
+    'expert': Markup('<span class="skill-badge expert">Expert</span>'),
+})
+
+# Fallback output used when a profile template fails to render
+FALLBACK_PROFILE_HTML = (
+    '<div class="profile-fallback">\n'
+    '    <h2>{headline}</h2>\n'
+    '    <p>{summary}</p>\n'
+    '    <div class="company">{current_company}</div>\n'
+    '    <div class="experience">{years_experience}+ years experience</div>\n'
+    '</div>\n'
+)
+FALLBACK_PROFILE_CSS = """\
+/* Fallback Professional Profile Styles */
+.profile-fallback {
+    font-family: Arial, sans-serif;
+    max-width: 800px;
+    margin: 0 auto;
+    padding: 20px;
+    background: #ffffff;
+    border: 1px solid #e1e5e9;
+    border-radius: 8px;
+}
+
+.profile-fallback h2 {
+    color: #2c3e50;
+    margin-bottom: 10px;
+}
+
+.profile-fallback p {
+    color: #34495e;
+    line-height: 1.6;
+    margin-bottom: 15px;
+}
+
+.profile-fallback .company {
+    font-weight: bold;
+    color: #3498db;
+    margin-bottom: 5px;
+}
+
+.profile-fallback .experience {
+    color: #7f8c8d;
+    font-style: italic;
+}
+"""
+
+# Rendered complete profiles are cached for this many seconds
+COMPLETE_PROFILE_CACHE_TIMEOUT = 300
+
+# Customized template CSS does not depend on the profile and its key carries
+# the template version, so it is kept longer
+CUSTOMIZED_CSS_CACHE_TIMEOUT = 3600
+
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _customizations_digest(customizations):
+    """Stable short digest of a customizations dict, independent of key order"""
+    return hashlib.blake2b(
+        orjson.dumps(customizations or {}, default=_orjson_default, option=orjson.OPT_SORT_KEYS),
+        digest_size=8
+    ).hexdigest()
+
+def json_response(payload, status=200):
+    """JSON response serialized with orjson (datetimes and dates encoded natively)"""
+    return HttpResponse(
+        orjson.dumps(payload, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS),
+        status=status,
+        content_type='application/json'
+    )
+
+def json_login_required(view_func):
+    """Reject anonymous requests with a JSON 401 before the view body runs"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return json_response({
+                'success': False,
+                'error': 'Authentication required'
+            }, status=401)
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
 class ProfileTemplateRenderer:
     """Renderer for profile templates with Jinja2 integration"""
     
+    __slots__ = ('jinja_env',)
+    
     def __init__(self):
-        self.jinja_env = engines['jinja2'].env
+        self.jinja_env = profile_environment()
+        
+        # The environment is shared, so register helpers once rather than per
+        # render; each is available both as a filter and as a global function
+        helpers = {
+            'truncate_text': self._truncate_text,
+            'format_date': self._format_date,
+            'format_duration': self._format_duration,
+            'skill_level_badge': self._skill_level_badge,
+            'is_valid_url': self._is_valid_url,
+        }
+        for name, helper in helpers.items():
+            self.jinja_env.filters.setdefault(name, helper)
+            self.jinja_env.globals.setdefault(name, helper)
     
     def render_profile(self, profile, template, customizations=None):
         """Render profile HTML using Jinja2 template"""
@@ -19,50 +263,74 @@ class ProfileTemplateRenderer:
             # Prepare template context
             context = self._prepare_template_context(profile, template, customizations)
             
-            # Add custom filters to environment
-            self.jinja_env.filters['truncate_text'] = self._truncate_text
-            
             # Render using Jinja2
-            jinja_template = self.jinja_env.from_string(template.html_template)
+            jinja_template = compile_profile_template(template.html_template)
             rendered_html = jinja_template.render(**context)
             
-            # Sanitize HTML for security
-            sanitized_html = self._sanitize_html(rendered_html)
-            
-            return mark_safe(sanitized_html)
+            # Sanitize HTML for security; the result goes out in JSON
+            # payloads and the joined document, never through Django
+            # template autoescaping, so it is not marked safe
+            return self._sanitize_html(rendered_html)
             
         except Exception as e:
-            logger.error(f"Error rendering profile template: {str(e)}")
+            logger.error("Error rendering profile template: %s", e)
             # Fallback to basic profile rendering
             return self._render_fallback_profile(profile)
     
     def render_css(self, template, customizations=None):
         """Render CSS with customizations"""
+        if not customizations and template.rendered_default_css:
+            return template.rendered_default_css
+        
         try:
+            # CSS only sees the template and customizations, so saved templates
+            # share one render per version and customization set
+            cache_key = None
+            if customizations and template.pk is not None and template.updated_at is not None:
+                cache_key = (
+                    f"template-css:{template.pk}:{template.updated_at.timestamp()}:"
+                    f"{_customizations_digest(customizations)}"
+                )
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             context = {
                 'template': template,
                 'customizations': customizations or {},
             }
             
-            jinja_template = self.jinja_env.from_string(template.css_template)
+            jinja_template = compile_profile_template(template.css_template)
             rendered_css = jinja_template.render(**context)
             
             # Validate CSS for security
             validated_css = self._validate_css(rendered_css)
             
+            if cache_key is not None:
+                cache.set(cache_key, validated_css, CUSTOMIZED_CSS_CACHE_TIMEOUT)
             return validated_css
             
         except Exception as e:
-            logger.error(f"Error rendering CSS template: {str(e)}")
+            logger.error("Error rendering CSS template: %s", e)
             return self._render_fallback_css()
     
+    def render_default_css(self, template):
+        """Render uncustomized CSS for storage, or '' if the template fails"""
+        try:
+            jinja_template = compile_profile_template(template.css_template)
+            return self._validate_css(jinja_template.render(template=template, customizations={}))
+        except Exception as e:
+            logger.error("Error rendering default CSS for template %s: %s", template.name, e)
+            return ''
+    
     def _prepare_template_context(self, profile, template, customizations=None):
         """Prepare comprehensive template context"""
         
-        # Basic profile information
+        # Related querysets are lazy already; values that need the user row
+        # are wrapped so templates that never use them skip the lookup
         context = {
             'profile': profile,
-            'user': profile.user,
+            'user': SimpleLazyObject(lambda: profile.user),
             'template': template,
             'customizations': customizations or {},
             
@@ -86,7 +354,7 @@ class ProfileTemplateRenderer:
             # Experience and education
             'experiences': profile.experiences.all(),
             'education': profile.education.all(),
-            'skills': profile.skills.all().order_by('order', 'name'),
+            'skills': profile.skills.all(),
             
             # Social links
             'social_links': {
@@ -97,59 +365,21 @@ class ProfileTemplateRenderer:
             },
             
             # Professional summary
-            'professional_summary': profile.get_professional_summary(),
+            'professional_summary': SimpleLazyObject(profile.get_professional_summary),
             
             # Profile URLs
-            'profile_url': profile.get_full_profile_url(),
+            'profile_url': SimpleLazyObject(profile.get_full_profile_url),
+            
+            # Shared by date helpers so the clock is read once per render
+            'today_ordinal': date.today().toordinal(),
         }
         
         # Add custom template variables
         if customizations:
             context.update(customizations)
         
-        # Add template-specific helpers
-        helpers = self._get_template_helpers()
-        if helpers:
-            context.update(helpers)
-        
         return context
     
-    def _get_template_helpers(self):
-        """Template helper functions for Jinja2"""
-        
-        def format_date(date_obj):
-            if not date_obj:
-                return ''
-            return date_obj.strftime('%B %Y')
-        
-        def format_duration(start_date, end_date=None, is_current=False):
-            if not start_date:
-                return ''
-            
-            if is_current or not end_date:
-                from datetime import date
-                duration = date.today() - start_date
-            else:
-                duration = end_date - start_date
-            
-            months = duration.days // 30
-            years = months // 12
-            remaining_months = months % 12
-            
-            if years > 0:
-                return f"{years} yr {remaining_months} mos"
-            else:
-                return f"{months} mos"
-        
-        def skill_level_badge(level):
-            badges = {
-                'beginner': '<span class="skill-badge beginner">Beginner</span>',
-                'intermediate': '<span class="skill-badge intermediate">Intermediate</span>',
-                'advanced': '<span class="skill-badge advanced">Advanced</span>',
-                'expert': '<span class="skill-badge expert">Expert</span>',
-            }
-            return badges.get(level, '')
-        
     def _truncate_text(self, text, length=150):
         """Truncate text to specified length"""
         if not text:
@@ -164,20 +394,20 @@ class ProfileTemplateRenderer:
             return ''
         return date_obj.strftime('%B %Y')
     
-    def _format_duration(self, start_date, end_date=None, is_current=False):
+    @pass_context
+    def _format_duration(self, context, start_date, end_date=None, is_current=False):
         """Format duration between dates"""
         if not start_date:
             return ''
         
         if is_current or not end_date:
-            from datetime import date
-            duration = date.today() - start_date
+            # Today's ordinal is read once per render in _prepare_template_context
+            end_ordinal = context.get('today_ordinal') or date.today().toordinal()
         else:
-            duration = end_date - start_date
+            end_ordinal = end_date.toordinal()
         
-        months = duration.days // 30
-        years = months // 12
-        remaining_months = months % 12
+        months = (end_ordinal - start_date.toordinal()) // 30
+        years, remaining_months = divmod(months, 12)
         
         if years > 0:
             return f"{years} yr {remaining_months} mos"
@@ -186,86 +416,30 @@ class ProfileTemplateRenderer:
     
     def _skill_level_badge(self, level):
         """Generate skill level badge HTML"""
-        badges = {
-            'beginner': '<span class="skill-badge beginner">Beginner</span>',
-            'intermediate': '<span class="skill-badge intermediate">Intermediate</span>',
-            'advanced': '<span class="skill-badge advanced">Advanced</span>',
-            'expert': '<span class="skill-badge expert">Expert</span>',
-        }
-        return badges.get(level, '')
+        return SKILL_LEVEL_BADGES.get(level, '')
     
     def _is_valid_url(self, url):
         """Check if URL is valid"""
         if not url:
             return False
         return url.startswith(('http://', 'https://'))
-        
-        def is_valid_url(url):
-            if not url:
-                return False
-            return url.startswith(('http://', 'https://'))
-        
-        return {
-            'format_date': format_date,
-            'format_duration': format_duration,
-            'skill_level_badge': skill_level_badge,
-            'truncate_text': truncate_text,
-            'is_valid_url': is_valid_url,
-        }
     
     def _sanitize_html(self, html_content):
         """Sanitize HTML to prevent XSS while allowing creative elements"""
         try:
-            # Basic HTML sanitization
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove dangerous tags and attributes
-            dangerous_tags = ['script', 'iframe', 'object', 'embed', 'form', 'input']
-            for tag in dangerous_tags:
-                for element in soup.find_all(tag):
-                    element.decompose()
-            
-            # Remove dangerous attributes
-            dangerous_attrs = ['onclick', 'onload', 'onerror', 'onmouseover', 'style']
-            for tag in soup.find_all():
-                for attr in dangerous_attrs:
-                    if tag.has_attr(attr):
-                        del tag[attr]
-            
-            # Allow certain safe attributes
-            safe_attrs = ['href', 'src', 'alt', 'title', 'class', 'id']
-            for tag in soup.find_all():
-                attrs = dict(tag.attrs)
-                for attr in attrs:
-                    if attr not in safe_attrs:
-                        del tag[attr]
-            
-            return str(soup)
+            # Single-pass allowlist clean; script/style contents are dropped
+            return _HTML_CLEANER.clean(html_content)
             
         except Exception as e:
-            logger.error(f"Error sanitizing HTML: {str(e)}")
+            logger.error("Error sanitizing HTML: %s", e)
             return '<div class="error">Profile rendering error</div>'
     
     def _validate_css(self, css_content):
         """Validate CSS against professional standards"""
         try:
-            # Remove dangerous CSS properties
-            dangerous_patterns = [
-                r'position\s*:\s*(fixed|absolute)',
-                r'z-index\s*:\s*\d+',
-                r'overflow\s*:\s*hidden',
-                r'cursor\s*:\s*pointer',
-                r'animation\s*:',
-                r'transition\s*:',
-                r'transform\s*:',
-                r'@import',
-                r'javascript:',
-                r'expression\s*\(',
-            ]
-            
-            validated_css = css_content
-            for pattern in dangerous_patterns:
-                validated_css = re.sub(pattern, '/* REMOVED */', validated_css, flags=re.IGNORECASE)
+            # Re-serialize from the parsed stylesheet, keeping allowed declarations only
+            rules = tinycss2.parse_stylesheet(css_content, skip_comments=True, skip_whitespace=True)
+            validated_css = _clean_css_rules(rules)
             
             # Add security comment
             validated_css = '/* CSS validated for professional standards */\n' + validated_css
@@ -273,96 +447,72 @@ class ProfileTemplateRenderer:
             return validated_css
             
         except Exception as e:
-            logger.error(f"Error validating CSS: {str(e)}")
+            logger.error("Error validating CSS: %s", e)
             return '/* CSS validation failed */\n.profile { font-family: Arial, sans-serif; }'
     
     def _render_fallback_profile(self, profile):
         """Fallback profile rendering if template fails"""
-        return f"""
-        <div class="profile-fallback">
-            <h2>{profile.headline}</h2>
-            <p>{profile.summary}</p>
-            <div class="company">{profile.current_company}</div>
-            <div class="experience">{profile.years_experience}+ years experience</div>
-        </div>
-        """
+        return format_html(
+            FALLBACK_PROFILE_HTML,
+            headline=profile.headline,
+            summary=profile.summary,
+            current_company=profile.current_company,
+            years_experience=profile.years_experience,
+        )
     
     def _render_fallback_css(self):
         """Fallback CSS if template CSS fails"""
-        return """
-        /* Fallback Professional Profile Styles */
-        .profile-fallback {
-            font-family: Arial, sans-serif;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background: #ffffff;
-            border: 1px solid #e1e5e9;
-            border-radius: 8px;
-        }
-        
-        .profile-fallback h2 {
-            color: #2c3e50;
-            margin-bottom: 10px;
-        }
-        
-        .profile-fallback p {
-            color: #34495e;
-            line-height: 1.6;
-            margin-bottom: 15px;
-        }
-        
-        .profile-fallback .company {
-            font-weight: bold;
-            color: #3498db;
-            margin-bottom: 5px;
-        }
-        
-        .profile-fallback .experience {
-            color: #7f8c8d;
-            font-style: italic;
-        }
-        """
+        return FALLBACK_PROFILE_CSS
+
+def _complete_profile_cache_key(profile, template, customizations):
+    """Cache key for a rendered complete profile.
+    
+    Profile and template timestamps are part of the key so edits to either
+    miss the cache. Experience, education, skill and top connection changes
+    bump the profile's updated_at; edits made on connected profiles expire
+    with the timeout.
+    """
+    return (
+        f"complete-profile:{profile.pk}:{profile.updated_at.timestamp()}:"
+        f"{template.pk}:{template.updated_at.timestamp()}:{_customizations_digest(customizations)}"
+    )
 
 class TemplateEngine:
     """High-level template engine for profile rendering"""
     
+    __slots__ = ('renderer',)
+    
     def __init__(self):
         self.renderer = ProfileTemplateRenderer()
     
     def render_complete_profile(self, profile, customizations=None):
-        """Render complete profile with HTML and CSS"""
+        """Render complete profile with HTML and CSS (pass Profile.load_for_render() to avoid N+1 queries)"""
         try:
             from .models import ProfileTemplate
             
             # Get current template
             template = ProfileTemplate.objects.get(name=profile.profile_template, is_active=True)
             
+            # Unsaved profiles have no stable identity to cache under
+            cache_key = None
+            if profile.pk is not None:
+                cache_key = _complete_profile_cache_key(profile, template, customizations)
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             # Render components
             html_content = self.renderer.render_profile(profile, template, customizations)
             css_content = self.renderer.render_css(template, customizations)
             
             # Combine into complete profile
-            complete_profile = f"""
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>{profile.headline} - Professional Profile</title>
-                <style>
-                    {css_content}
-                </style>
-            </head>
-            <body>
-                <div class="profile-container">
-                    {html_content}
-                </div>
-            </body>
-            </html>
-            """
+            complete_profile = ''.join((
+                DOCUMENT_HEAD, profile.headline, DOCUMENT_STYLE_OPEN,
+                css_content, DOCUMENT_BODY_OPEN,
+                html_content, DOCUMENT_TAIL,
+            ))
             
-            return {
+            result = {
                 'success': True,
                 'html': html_content,
                 'css': css_content,
@@ -373,6 +523,9 @@ class TemplateEngine:
                     'type': template.template_type,
                 }
             }
+            if cache_key is not None:
+                cache.set(cache_key, result, COMPLETE_PROFILE_CACHE_TIMEOUT)
+            return result
             
         except ProfileTemplate.DoesNotExist:
             return {
@@ -380,12 +533,31 @@ class TemplateEngine:
                 'error': 'Template not found'
             }
         except Exception as e:
-            logger.error(f"Error rendering complete profile: {str(e)}")
+            logger.error("Error rendering complete profile: %s", e)
             return {
                 'success': False,
                 'error': 'Profile rendering failed'
             }
     
+    def stream_complete_profile(self, profile, customizations=None):
+        """Return the complete profile document as fragments for StreamingHttpResponse.
+        
+        The template is looked up and rendered before anything is returned, so
+        ProfileTemplate.DoesNotExist reaches the caller instead of failing
+        mid-stream.
+        """
+        from .models import ProfileTemplate
+        
+        template = ProfileTemplate.objects.get(name=profile.profile_template, is_active=True)
+        html_content = self.renderer.render_profile(profile, template, customizations)
+        css_content = self.renderer.render_css(template, customizations)
+        
+        return iter((
+            DOCUMENT_HEAD, profile.headline, DOCUMENT_STYLE_OPEN,
+            css_content, DOCUMENT_BODY_OPEN,
+            html_content, DOCUMENT_TAIL,
+        ))
+    
     def preview_template(self, template_id, customizations=None):
         """Preview template with sample data"""
         try:
@@ -395,14 +567,7 @@ class TemplateEngine:
             
             # Create sample profile data for preview
             sample_profile = Profile(
-                headline="Sample Professional Profile",
-                summary="This is a sample profile to preview the template design and layout.",
-                current_company="Sample Company",
-                current_position="Sample Position",
-                industry="Technology",
-                location="San Francisco, CA",
-                years_experience=5,
-                skills_list=["Python", "Django", "JavaScript", "UI/UX Design"],
+                **SAMPLE_PROFILE_FIELDS,
                 background_image_url=customizations.get('background_image_url', '') if customizations else '',
             )
             
@@ -429,8 +594,13 @@ class TemplateEngine:
                 'error': 'Template not found'
             }
         except Exception as e:
-            logger.error(f"Error previewing template: {str(e)}")
+            logger.error("Error previewing template: %s", e)
             return {
                 'success': False,
                 'error': 'Template preview failed'
-            }
\ No newline at end of file
+            }
+
+
+# Process-wide instances; both are stateless apart from the shared environment
+default_engine = TemplateEngine()
+default_renderer = default_engine.renderer
@@ -1,59 +1,146 @@
-from django.http import JsonResponse, HttpResponseBadRequest
-from django.views.decorators.http import require_http_methods
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotModified
+from django.views.decorators.http import condition, require_http_methods
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
 from django.utils.decorators import method_decorator
+from django.utils.http import parse_etags, quote_etag
 from django.views import View
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.db import DatabaseError, transaction
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-import json
+import hashlib
 import logging
+import orjson
 
-from .models import Profile, ProfileTemplate, ProfileTheme
-from .utils import ProfileTemplateRenderer
+from .models import (
+    Profile, ProfileTemplate, ProfileTheme, catalog_version, get_catalog_infos,
+    validate_css_professional_standards,
+)
+from .utils import default_renderer, json_login_required, json_response
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# How long a serialized catalog listing is reused; usage counts bumped
+# without a save can lag by up to this long
+CATALOG_LISTING_CACHE_TIMEOUT = 300
+
+# Rows read per database round trip when building a listing
+CATALOG_LISTING_CHUNK_SIZE = 200
+
+# Columns serialized by the catalog endpoints
+TEMPLATE_LIST_FIELDS = (
+    'id', 'name', 'display_name', 'description', 'category', 'template_type',
+    'preview_image_url', 'color_scheme', 'customization_options',
+    'usage_count', 'is_featured',
+)
+THEME_LIST_FIELDS = (
+    'id', 'name', 'display_name', 'description', 'theme_type',
+    'primary_color', 'secondary_color', 'background_color', 'text_color',
+    'accent_color', 'font_family', 'heading_font', 'usage_count', 'is_featured',
+)
+
+def _theme_listing_row(theme):
+    """Nest a theme values() row into the catalog payload shape"""
+    return {
+        'id': theme['id'],
+        'name': theme['name'],
+        'display_name': theme['display_name'],
+        'description': theme['description'],
+        'theme_type': theme['theme_type'],
+        'color_palette': {
+            'primary': theme['primary_color'],
+            'secondary': theme['secondary_color'],
+            'background': theme['background_color'],
+            'text': theme['text_color'],
+            'accent': theme['accent_color'],
+        },
+        'typography': {
+            'font_family': theme['font_family'],
+            'heading_font': theme['heading_font'],
+        },
+        'usage_count': theme['usage_count'],
+        'is_featured': theme['is_featured'],
+    }
+
+def _cached_listing(model, filter_value, build):
+    """Serialized catalog rows for one filter value plus their ETag, shared through the cache"""
+    # The version token rotates whenever a row is saved or deleted
+    digest = hashlib.blake2b(filter_value.encode(), digest_size=8).hexdigest()
+    key = f"catalog-listing:{model._meta.model_name}:{catalog_version(model)}:{digest}"
+    listing = cache.get(key)
+    if listing is None:
+        # Each row is serialized as it comes off the cursor, so only bytes are kept
+        rows = []
+        etag = hashlib.blake2b(digest_size=8)
+        for item in build():
+            row = orjson.dumps(item)
+            etag.update(row)
+            rows.append(row)
+        listing = {'etag': etag.hexdigest(), 'rows': rows}
+        cache.set(key, listing, CATALOG_LISTING_CACHE_TIMEOUT)
+    return listing
+
+def _listing_response(name, rows):
+    """Join serialized rows into {"success": true, name: [...], "total": n}"""
+    # The rows are already in memory (usually from the cache), so one buffered
+    # body keeps Content-Length and costs nothing a stream would save
+    body = b'{"success":true,"%s":[%s],"total":%d}' % (name.encode(), b','.join(rows), len(rows))
+    return HttpResponse(body, content_type='application/json')
+
+def _template_listing(request):
+    """Active templates, filtered by category if provided"""
+    category = request.GET.get('category', '')
+    
+    def build():
+        templates = ProfileTemplate.objects.filter(is_active=True)
+        if category:
+            templates = templates.filter(category=category)
+        # Rows come back as dicts straight from the cursor
+        return templates.values(*TEMPLATE_LIST_FIELDS).iterator(chunk_size=CATALOG_LISTING_CHUNK_SIZE)
+    
+    return _cached_listing(ProfileTemplate, category, build)
+
+def _theme_listing(request):
+    """Active themes, filtered by type if provided"""
+    theme_type = request.GET.get('type', '')
+    
+    def build():
+        themes = ProfileTheme.objects.filter(is_active=True)
+        if theme_type:
+            themes = themes.filter(theme_type=theme_type)
+        rows = themes.values(*THEME_LIST_FIELDS).iterator(chunk_size=CATALOG_LISTING_CHUNK_SIZE)
+        return map(_theme_listing_row, rows)
+    
+    return _cached_listing(ProfileTheme, theme_type, build)
+
+def _template_listing_etag(request, *args, **kwargs):
+    return _template_listing(request)['etag']
+
+def _theme_listing_etag(request, *args, **kwargs):
+    return _theme_listing(request)['etag']
+
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(gzip_page, name='dispatch')
+@method_decorator(condition(etag_func=_template_listing_etag), name='get')
 class ProfileTemplateView(View):
     """API for managing profile templates"""
     
     def get(self, request):
         """Get available templates"""
         try:
-            templates = ProfileTemplate.objects.filter(is_active=True)
-            
-            # Filter by category if provided
-            category = request.GET.get('category')
-            if category:
-                templates = templates.filter(category=category)
-            
-            template_data = []
-            for template in templates:
-                template_data.append({
-                    'id': template.id,
-                    'name': template.name,
-                    'display_name': template.display_name,
-                    'description': template.description,
-                    'category': template.category,
-                    'template_type': template.template_type,
-                    'preview_image_url': template.preview_image_url,
-                    'color_scheme': template.color_scheme,
-                    'customization_options': template.customization_options,
-                    'usage_count': template.usage_count,
-                    'is_featured': template.is_featured,
-                })
-            
-            return JsonResponse({
-                'success': True,
-                'templates': template_data,
-                'total': len(template_data)
-            })
+            return _listing_response('templates', _template_listing(request)['rows'])
             
+        except DatabaseError as e:
+            logger.error("Database error fetching templates: %s", e)
+            return json_response({
+                'success': False,
+                'error': 'Failed to fetch templates'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error fetching templates: {str(e)}")
-            return JsonResponse({
+            logger.error("Error fetching templates: %s", e)
+            return json_response({
                 'success': False,
                 'error': 'Failed to fetch templates'
             }, status=500)
@@ -62,12 +149,12 @@ class ProfileTemplateView(View):
         """Create new template (admin function)"""
         try:
             if not request.user.is_authenticated or not request.user.is_staff:
-                return JsonResponse({
+                return json_response({
                     'success': False,
                     'error': 'Admin access required'
                 }, status=403)
             
-            data = json.loads(request.body)
+            data = orjson.loads(request.body)
             
             template = ProfileTemplate.objects.create(
                 name=data['name'],
@@ -84,63 +171,66 @@ class ProfileTemplateView(View):
                 is_featured=data.get('is_featured', False),
             )
             
-            return JsonResponse({
+            return json_response({
                 'success': True,
                 'template_id': template.id,
                 'message': 'Template created successfully'
             })
             
-        except (json.JSONDecodeError, KeyError) as e:
-            return JsonResponse({
+        except (orjson.JSONDecodeError, KeyError) as e:
+            return json_response({
                 'success': False,
                 'error': 'Invalid data provided'
             }, status=400)
+        except DatabaseError as e:
+            logger.error("Database error creating template: %s", e)
+            return json_response({
+                'success': False,
+                'error': 'Failed to create template'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error creating template: {str(e)}")
-            return JsonResponse({
+            logger.error("Error creating template: %s", e)
+            return json_response({
                 'success': False,
                 'error': 'Failed to create template'
             }, status=500)
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(json_login_required, name='dispatch')
 class ProfileTemplateSelectionView(View):
     """API for selecting and applying templates to profiles"""
     
     def post(self, request):
         """Apply template to user's profile"""
         try:
-            if not request.user.is_authenticated:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Authentication required'
-                }, status=401)
-            
-            data = json.loads(request.body)
+            data = orjson.loads(request.body)
             template_id = data.get('template_id')
             customizations = data.get('customizations', {})
             
             # Get template and profile
             template = ProfileTemplate.objects.get(id=template_id, is_active=True)
-            profile = request.user.clawedin_profile
+            profile = Profile.load_for_render(user=request.user)
             
-            # Apply template
+            # Apply template, writing only the columns that change; updated_at
+            # is included so cached renders of the profile expire
             with transaction.atomic():
                 profile.profile_template = template.name
+                update_fields = ['profile_template', 'updated_at']
                 if customizations:
                     profile.custom_css = customizations.get('custom_css', '')
                     profile.background_image_url = customizations.get('background_image_url', '')
+                    update_fields += ['custom_css', 'background_image_url']
                 
-                profile.save()
+                profile.save(update_fields=update_fields)
                 
                 # Update template usage
                 template.increment_usage()
             
             # Render profile with new template
-            renderer = ProfileTemplateRenderer()
-            rendered_html = renderer.render_profile(profile, template, customizations)
-            rendered_css = renderer.render_css(template, customizations)
+            rendered_html = default_renderer.render_profile(profile, template, customizations)
+            rendered_css = default_renderer.render_css(template, customizations)
             
-            return JsonResponse({
+            return json_response({
                 'success': True,
                 'message': 'Template applied successfully',
                 'template_applied': template.display_name,
@@ -149,13 +239,19 @@ class ProfileTemplateSelectionView(View):
             })
             
         except ProfileTemplate.DoesNotExist:
-            return JsonResponse({
+            return json_response({
                 'success': False,
                 'error': 'Template not found'
             }, status=404)
+        except DatabaseError as e:
+            logger.error("Database error applying template: %s", e)
+            return json_response({
+                'success': False,
+                'error': 'Failed to apply template'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error applying template: {str(e)}")
-            return JsonResponse({
+            logger.error("Error applying template: %s", e)
+            return json_response({
                 'success': False,
                 'error': 'Failed to apply template'
             }, status=500)
@@ -163,29 +259,38 @@ class ProfileTemplateSelectionView(View):
     def get(self, request):
         """Preview template with user's profile data"""
         try:
-            if not request.user.is_authenticated:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Authentication required'
-                }, status=401)
-            
             template_id = request.GET.get('template_id')
             customizations = request.GET.get('customizations', '{}')
             
             try:
-                customizations = json.loads(customizations)
-            except json.JSONDecodeError:
+                customizations = orjson.loads(customizations)
+            except orjson.JSONDecodeError:
                 customizations = {}
             
             template = ProfileTemplate.objects.get(id=template_id, is_active=True)
-            profile = request.user.clawedin_profile
+            
+            # Polling clients repeat the same preview; answer those from the
+            # ETag before loading profile relations or rendering anything
+            profile_updated_at = Profile.objects.filter(
+                user=request.user
+            ).values_list('updated_at', flat=True).get()
+            etag = quote_etag(hashlib.blake2b(
+                f"{template.pk}:{template.updated_at.timestamp()}:{profile_updated_at.timestamp()}:".encode()
+                + orjson.dumps(customizations, option=orjson.OPT_SORT_KEYS),
+                digest_size=16
+            ).hexdigest())
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                return response
+            
+            profile = Profile.load_for_render(user=request.user)
             
             # Render preview
-            renderer = ProfileTemplateRenderer()
-            rendered_html = renderer.render_profile(profile, template, customizations)
-            rendered_css = renderer.render_css(template, customizations)
+            rendered_html = default_renderer.render_profile(profile, template, customizations)
+            rendered_css = default_renderer.render_css(template, customizations)
             
-            return JsonResponse({
+            response = json_response({
                 'success': True,
                 'template': {
                     'id': template.id,
@@ -197,65 +302,48 @@ class ProfileTemplateSelectionView(View):
                 'preview_css': rendered_css,
                 'customizations_used': customizations
             })
+            response['ETag'] = etag
+            return response
             
         except ProfileTemplate.DoesNotExist:
-            return JsonResponse({
+            return json_response({
                 'success': False,
                 'error': 'Template not found'
             }, status=404)
+        except DatabaseError as e:
+            logger.error("Database error previewing template: %s", e)
+            return json_response({
+                'success': False,
+                'error': 'Failed to preview template'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error previewing template: {str(e)}")
-            return JsonResponse({
+            logger.error("Error previewing template: %s", e)
+            return json_response({
                 'success': False,
                 'error': 'Failed to preview template'
             }, status=500)
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(gzip_page, name='dispatch')
+@method_decorator(condition(etag_func=_theme_listing_etag), name='get')
+@method_decorator(json_login_required, name='post')
 class ProfileThemeView(View):
     """API for managing profile themes"""
     
     def get(self, request):
         """Get available themes"""
         try:
-            themes = ProfileTheme.objects.filter(is_active=True)
-            
-            # Filter by type if provided
-            theme_type = request.GET.get('type')
-            if theme_type:
-                themes = themes.filter(theme_type=theme_type)
-            
-            theme_data = []
-            for theme in themes:
-                theme_data.append({
-                    'id': theme.id,
-                    'name': theme.name,
-                    'display_name': theme.display_name,
-                    'description': theme.description,
-                    'theme_type': theme.theme_type,
-                    'color_palette': {
-                        'primary': theme.primary_color,
-                        'secondary': theme.secondary_color,
-                        'background': theme.background_color,
-                        'text': theme.text_color,
-                        'accent': theme.accent_color,
-                    },
-                    'typography': {
-                        'font_family': theme.font_family,
-                        'heading_font': theme.heading_font,
-                    },
-                    'usage_count': theme.usage_count,
-                    'is_featured': theme.is_featured,
-                })
-            
-            return JsonResponse({
-                'success': True,
-                'themes': theme_data,
-                'total': len(theme_data)
-            })
+            return _listing_response('themes', _theme_listing(request)['rows'])
             
+        except DatabaseError as e:
+            logger.error("Database error fetching themes: %s", e)
+            return json_response({
+                'success': False,
+                'error': 'Failed to fetch themes'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error fetching themes: {str(e)}")
-            return JsonResponse({
+            logger.error("Error fetching themes: %s", e)
+            return json_response({
                 'success': False,
                 'error': 'Failed to fetch themes'
             }, status=500)
@@ -263,40 +351,44 @@ class ProfileThemeView(View):
     def post(self, request):
         """Apply theme to user's profile"""
         try:
-            if not request.user.is_authenticated:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Authentication required'
-                }, status=401)
-            
-            data = json.loads(request.body)
+            data = orjson.loads(request.body)
             theme_id = data.get('theme_id')
             
-            theme = ProfileTheme.objects.get(id=theme_id, is_active=True)
-            profile = request.user.clawedin_profile
+            # The response only needs the palette and typography columns
+            theme = ProfileTheme.objects.defer(
+                'description', 'css_variables', 'full_css'
+            ).get(id=theme_id, is_active=True)
+            # Nothing is rendered here, so only the theme pointer is loaded
+            profile = Profile.objects.only('id', 'profile_theme').get(user=request.user)
             
             with transaction.atomic():
                 profile.profile_theme = theme.name
-                profile.save()
+                profile.save(update_fields=['profile_theme', 'updated_at'])
                 
                 # Update theme usage
                 theme.increment_usage()
             
-            return JsonResponse({
+            return json_response({
                 'success': True,
                 'message': 'Theme applied successfully',
                 'theme_applied': theme.display_name,
-                'css_variables': theme.to_css_variables()
+                'css_variables': dict(theme.to_css_variables())
             })
             
         except ProfileTheme.DoesNotExist:
-            return JsonResponse({
+            return json_response({
                 'success': False,
                 'error': 'Theme not found'
             }, status=404)
+        except DatabaseError as e:
+            logger.error("Database error applying theme: %s", e)
+            return json_response({
+                'success': False,
+                'error': 'Failed to apply theme'
+            }, status=503)
         except Exception as e:
-            logger.error(f"Error applying theme: {str(e)}")
-            return JsonResponse({
+            logger.error("Error applying theme: %s", e)
+            return json_response({
                 'success': False,
                 'error': 'Failed to apply theme'
             }, status=500)
@@ -305,105 +397,93 @@ class ProfileThemeView(View):
 def get_template_categories(request):
     """Get available template categories"""
     try:
-        categories = ProfileTemplate.objects.values_list('category', flat=True).distinct()
+        # Meta.ordering columns would otherwise join the SELECT DISTINCT and
+        # repeat categories; ordering by category also walks its index
+        categories = cache.get_or_set(
+            f"template-categories:{catalog_version(ProfileTemplate)}",
+            lambda: list(
+                ProfileTemplate.objects.order_by('category')
+                .values_list('category', flat=True).distinct()
+            ),
+            CATALOG_LISTING_CACHE_TIMEOUT
+        )
         
-        return JsonResponse({
+        return json_response({
             'success': True,
-            'categories': list(categories)
+            'categories': categories
         })
         
+    except DatabaseError as e:
+        logger.error("Database error fetching categories: %s", e)
+        return json_response({
+            'success': False,
+            'error': 'Failed to fetch categories'
+        }, status=503)
     except Exception as e:
-        logger.error(f"Error fetching categories: {str(e)}")
-        return JsonResponse({
+        logger.error("Error fetching categories: %s", e)
+        return json_response({
             'success': False,
             'error': 'Failed to fetch categories'
         }, status=500)
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@json_login_required
 def validate_custom_css(request):
     """Validate custom CSS against professional standards"""
     try:
-        if not request.user.is_authenticated:
-            return JsonResponse({
-                'success': False,
-                'error': 'Authentication required'
-            }, status=401)
-        
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         css_code = data.get('css_code', '')
         
         if not css_code.strip():
-            return JsonResponse({
+            return json_response({
                 'success': True,
                 'is_valid': True,
                 'message': 'Empty CSS is valid'
             })
         
-        # Create a temporary profile instance to validate
-        profile = Profile(user=request.user)
-        is_valid, message = profile.validate_css_professional_standards(css_code)
+        is_valid, message = validate_css_professional_standards(css_code)
         
-        return JsonResponse({
+        return json_response({
             'success': True,
             'is_valid': is_valid,
             'message': message
         })
         
-    except (json.JSONDecodeError, KeyError):
-        return JsonResponse({
+    except (orjson.JSONDecodeError, KeyError):
+        return json_response({
             'success': False,
             'error': 'Invalid request data'
         }, status=400)
+    except DatabaseError as e:
+        logger.error("Database error validating CSS: %s", e)
+        return json_response({
+            'success': False,
+            'error': 'Failed to validate CSS'
+        }, status=503)
     except Exception as e:
-        logger.error(f"Error validating CSS: {str(e)}")
-        return JsonResponse({
+        logger.error("Error validating CSS: %s", e)
+        return json_response({
             'success': False,
             'error': 'Failed to validate CSS'
         }, status=500)
 
 @require_http_methods(["GET"])
+@json_login_required
 def get_user_customization(request):
     """Get user's current profile customization settings"""
     try:
-        if not request.user.is_authenticated:
-            return JsonResponse({
-                'success': False,
-                'error': 'Authentication required'
-            }, status=401)
-        
-        profile = request.user.clawedin_profile
+        # Only the customization columns are serialized below
+        profile = Profile.objects.only(
+            'profile_template', 'profile_theme', 'custom_css',
+            'background_image_url', 'profile_visibility', 'show_contact_info',
+        ).get(user=request.user)
         
-        # Get current template and theme info
-        try:
-            current_template = ProfileTemplate.objects.get(name=profile.profile_template)
-            template_info = {
-                'id': current_template.id,
-                'name': current_template.name,
-                'display_name': current_template.display_name,
-                'category': current_template.category,
-                'template_type': current_template.template_type,
-                'customization_options': current_template.customization_options,
-            }
-        except ProfileTemplate.DoesNotExist:
-            template_info = None
-        
-        try:
-            current_theme = ProfileTheme.objects.get(name=profile.profile_theme)
-            theme_info = {
-                'id': current_theme.id,
-                'display_name': current_theme.display_name,
-                'theme_type': current_theme.theme_type,
-                'color_palette': {
-                    'primary': current_theme.primary_color,
-                    'secondary': current_theme.secondary_color,
-                    'background': current_theme.background_color,
-                    'text': current_theme.text_color,
-                    'accent': current_theme.accent_color,
-                },
-            }
-        except ProfileTheme.DoesNotExist:
-            theme_info = None
+        # Template and theme summaries change rarely and are served from the cache
+        template_info, theme_info = get_catalog_infos(
+            (ProfileTemplate, profile.profile_template),
+            (ProfileTheme, profile.profile_theme),
+        )
         
         customization_data = {
             'current_template': template_info,
@@ -414,14 +494,20 @@ def get_user_customization(request):
             'show_contact_info': profile.show_contact_info,
         }
         
-        return JsonResponse({
+        return json_response({
             'success': True,
             'customization': customization_data
         })
         
+    except DatabaseError as e:
+        logger.error("Database error fetching user customization: %s", e)
+        return json_response({
+            'success': False,
+            'error': 'Failed to fetch customization settings'
+        }, status=503)
     except Exception as e:
-        logger.error(f"Error fetching user customization: {str(e)}")
-        return JsonResponse({
+        logger.error("Error fetching user customization: %s", e)
+        return json_response({
             'success': False,
             'error': 'Failed to fetch customization settings'
         }, status=500)
\ No newline at end of file
@@ -0,0 +1,10 @@
+"""
+Shared pytest configuration
+"""
+
+def pytest_configure(config):
+    """Use a cheap password hasher for the whole test run"""
+    from django.conf import settings
+
+    # identity tests create users with passwords; skip the slow production hasher
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
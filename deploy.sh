@@ -25,6 +25,7 @@ sudo -u "$APP_USER" bash -c "
 echo "🗄️  Applying migrations..."
 sudo -u "$APP_USER" bash -c "
   source $APP_DIR/.venv/bin/activate
+  python manage.py createcachetable
   python manage.py migrate
 "
 